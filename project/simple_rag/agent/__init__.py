@@ -1,5 +1,5 @@
 """Agentes do sistema."""
 
-from simple_rag.agent.agent import MessagesState, create_agent
+from simple_rag.agent.agent import MessagesState, create_agent, get_agent
 
-__all__ = ["MessagesState", "create_agent"]
+__all__ = ["MessagesState", "create_agent", "get_agent"]
@@ -1,7 +1,9 @@
 """Agente baseado em Ollama e LangGraph."""
 
+import asyncio
 import operator
-from typing import Annotated, Literal, TypedDict
+from functools import lru_cache
+from typing import Annotated, Final, Literal, TypedDict
 
 from langchain_core.messages import (
     AIMessage,
@@ -11,25 +13,67 @@ from langchain_core.messages import (
     ToolMessage,
 )
 from langchain_ollama import ChatOllama
+from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
 from simple_rag.config.config import settings
-from simple_rag.tools import add, multiply, retrieve_context
+from simple_rag.tools import embed_queries, retrieve_context
 from simple_rag.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Configuração do LLM
-llm = ChatOllama(
-    model=settings.ollama_model,
-    temperature=settings.ollama_temperature,
-    base_url=settings.ollama_base_url,
-)
-
-# Ferramentas disponíveis
-tools = [retrieve_context]
+# Ferramentas disponíveis (ordenadas para um schema determinístico no prompt)
+tools = sorted([retrieve_context], key=lambda t: t.name)
 tools_by_name = {tool.name: tool for tool in tools}
-llm_with_tools = llm.bind_tools(tools)
+
+# Valores lidos do settings uma única vez, no import, para uso nos nós do grafo.
+# A mensagem de sistema é um único objeto: prefixo idêntico em toda chamada.
+SYSTEM_MSG: Final = SystemMessage(content=settings.system_message)
+TOOLS_BY_NAME: Final = tools_by_name
+HISTORY_WINDOW: Final[int] = settings.history_window
+HISTORY_SUMMARY_TRIGGER: Final[int] = settings.history_summary_trigger
+MAX_NEW_TOKENS: Final[int] = settings.max_new_tokens
+MAX_NUM_CTX: Final[int] = settings.ollama_max_ctx
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOllama:
+    """Cria o cliente do LLM uma única vez e o reutiliza entre sessões.
+
+    Todas as chamadas usam o mesmo num_ctx (settings.ollama_max_ctx): o Ollama
+    recarrega o modelo quando o num_ctx muda entre requisições, o que também
+    descarta o KV-cache do prefixo do prompt.
+
+    Returns:
+        Instância compartilhada de ChatOllama
+    """
+    return ChatOllama(
+        model=settings.ollama_model,
+        temperature=settings.ollama_temperature,
+        base_url=settings.ollama_base_url,
+        num_ctx=MAX_NUM_CTX,
+        num_predict=MAX_NEW_TOKENS,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm_with_tools():
+    """Retorna o LLM com as ferramentas já vinculadas.
+
+    Returns:
+        LLM compartilhado com tools vinculadas
+    """
+    return get_llm().bind_tools(tools)
+
+
+# Tag usada nas chamadas de resumo, para que não sejam exibidas ao usuário
+SUMMARY_TAG = "history_summary"
+
+SUMMARY_PROMPT = (
+    "Resuma a conversa a seguir em no máximo 200 tokens, preservando as "
+    "informações relevantes sobre os pacientes e as perguntas já respondidas."
+)
+SUMMARY_MSG: Final = SystemMessage(content=SUMMARY_PROMPT)
 
 
 class MessagesState(TypedDict):
@@ -37,67 +81,216 @@ class MessagesState(TypedDict):
 
     messages: Annotated[list[AnyMessage], operator.add]
     llm_calls: int
+    # Resumo das mensagens[:summarized_count], enviado no lugar delas ao LLM
+    history_summary: str
+    summarized_count: int
+    # Turno respondido sem chamar o LLM (saudação ou mensagem vazia)
+    direct: bool
+
+
+# Entradas respondidas diretamente, sem chamar o LLM
+GREETINGS: Final = frozenset(
+    {"oi", "olá", "ola", "bom dia", "boa tarde", "boa noite", "hello", "hi", "hey"}
+)
+# Entradas mais longas que a maior saudação nem são procuradas no conjunto
+_MAX_GREETING_LEN: Final = max(map(len, GREETINGS))
+GREETING_REPLY = (
+    "Olá! Como posso ajudar? Faça uma pergunta sobre as anamneses ou envie um PDF."
+)
+EMPTY_REPLY = "Digite sua pergunta para começar."
+
+
+def _normalize_query(content) -> str:
+    """Normaliza o texto de uma mensagem para comparação."""
+    return str(content).strip().lower().rstrip("!.?")
+
+
+def classify(state: MessagesState):
+    """Responde entradas triviais sem chamar o LLM.
 
+    Saudações e mensagens vazias recebem uma resposta fixa. As demais seguem
+    para o LLM, inclusive perguntas repetidas: a resposta anterior pode ter
+    ficado desatualizada (ex.: após o upload de um PDF) e quem repete a
+    pergunta costuma querer uma nova resposta.
 
-def ollama_call(state: MessagesState):
+    Args:
+        state: Estado atual com mensagens
+
+    Returns:
+        Novo estado, com "direct" indicando se o turno já foi respondido
+    """
+    question = _normalize_query(state["messages"][-1].content)
+
+    if not question:
+        answer: str | None = EMPTY_REPLY
+    elif len(question) <= _MAX_GREETING_LEN and question in GREETINGS:
+        answer = GREETING_REPLY
+    else:
+        answer = None
+
+    # Início do turno: zera o contador, que o checkpointer mantém entre turnos
+    if answer is None:
+        return {"direct": False, "llm_calls": 0}
+
+    logger.info("Resposta direta, sem chamada ao LLM")
+    return {"messages": [AIMessage(content=answer)], "direct": True, "llm_calls": 0}
+
+
+def route_after_classify(state: MessagesState) -> Literal["ollama_call", "__end__"]:
+    """Encerra o turno se classify já respondeu, senão segue para o LLM.
+
+    Args:
+        state: Estado atual
+
+    Returns:
+        Próximo nó ou END
+    """
+    if state.get("direct"):
+        return "__end__"
+    return "ollama_call"
+
+
+def _window_start(messages: list[AnyMessage], k: int) -> int:
+    """Retorna o índice inicial da janela com as últimas k mensagens.
+
+    A janela nunca começa em uma ToolMessage, para não separá-la da tool call
+    que a originou.
+
+    Args:
+        messages: Histórico completo
+        k: Tamanho da janela
+
+    Returns:
+        Índice da primeira mensagem da janela
+    """
+    start = max(len(messages) - k, 0)
+    while start > 0 and isinstance(messages[start], ToolMessage):
+        start -= 1
+    return start
+
+
+async def _summarize(messages: list[AnyMessage], previous_summary: str) -> str:
+    """Resume mensagens antigas, incorporando o resumo anterior se houver.
+
+    Args:
+        messages: Mensagens a resumir
+        previous_summary: Resumo já existente das mensagens mais antigas
+
+    Returns:
+        Novo resumo
+    """
+    prompt: list[AnyMessage] = [SUMMARY_MSG]
+    if previous_summary:
+        prompt.append(SystemMessage(content=f"Resumo anterior: {previous_summary}"))
+    prompt.extend(messages)
+    response = await get_llm().ainvoke(prompt, config={"tags": [SUMMARY_TAG]})
+    return str(response.content)
+
+
+async def ollama_call(state: MessagesState):
     """LLM decide se deve chamar uma ferramenta ou não.
 
+    Apenas as mensagens ainda não resumidas são enviadas ao LLM. Quando elas
+    passam de `history_summary_trigger` no início de um turno, as mais antigas
+    (fora das últimas `history_window`) são resumidas e substituídas pelo resumo
+    no prompt. O estado (persistido pelo checkpointer) continua guardando o
+    histórico completo.
+
     Args:
         state: Estado atual com mensagens
 
     Returns:
         Novo estado com resposta do LLM
     """
-    messages: list[AnyMessage] = [
-        SystemMessage(content=settings.system_message),
-        *state["messages"],
-    ]
+    history = state["messages"]
+    summary = state.get("history_summary", "")
+    summarized = state.get("summarized_count", 0)
+    update: dict = {}
+
+    # Resume no máximo uma vez por turno, antes da primeira chamada ao LLM
+    if (
+        isinstance(history[-1], HumanMessage)
+        and len(history) - summarized > HISTORY_SUMMARY_TRIGGER
+    ):
+        start = _window_start(history, HISTORY_WINDOW)
+        if start > summarized:
+            summary = await _summarize(history[summarized:start], summary)
+            summarized = start
+            update = {"history_summary": summary, "summarized_count": summarized}
+            logger.info(f"Histórico resumido: {summarized} mensagem(ns) antigas")
+
+    messages: list[AnyMessage] = [SYSTEM_MSG]
+    if summary:
+        messages.append(
+            SystemMessage(content=f"Resumo da conversa anterior: {summary}")
+        )
+    messages.extend(history[summarized:])
+
     return {
-        "messages": [llm_with_tools.invoke(messages)],
+        **update,
+        "messages": [await get_llm_with_tools().ainvoke(messages)],
         "llm_calls": state.get("llm_calls", 0) + 1,
     }
 
 
-def tool_node(state: MessagesState):
+async def tool_node(state: MessagesState):
     """Executa as ferramentas chamadas pelo LLM.
 
+    Quando o LLM emite várias tool calls, elas são executadas concorrentemente.
+
     Args:
         state: Estado atual com tool calls
 
     Returns:
         Novo estado com resultados das ferramentas
     """
-    result = []
     last_message = state["messages"][-1]
-    if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        for tool_call in last_message.tool_calls:
-            tool = tools_by_name[tool_call["name"]]
-            logger.debug(f"Executando ferramenta: {tool_call['name']}")
-            observation = tool.invoke(tool_call["args"])
-            result.append(
-                ToolMessage(content=str(observation), tool_call_id=tool_call["id"])
-            )
+    if not (isinstance(last_message, AIMessage) and last_message.tool_calls):
+        return {"messages": []}
+
+    tool_calls = last_message.tool_calls
+    args_by_id = {tool_call["id"]: tool_call["args"] for tool_call in tool_calls}
+    for tool_call in tool_calls:
+        logger.debug(f"Executando ferramenta: {tool_call['name']}")
+
+    # Várias buscas paralelas: embeddings de todas as queries em uma requisição
+    retrieve_calls = [tc for tc in tool_calls if tc["name"] == retrieve_context.name]
+    if len(retrieve_calls) > 1:
+        vectors = await embed_queries([tc["args"]["query"] for tc in retrieve_calls])
+        for tool_call, vector in zip(retrieve_calls, vectors, strict=True):
+            args_by_id[tool_call["id"]] = {**tool_call["args"], "embedding": vector}
+
+    observations = await asyncio.gather(
+        *(
+            TOOLS_BY_NAME[tool_call["name"]].ainvoke(args_by_id[tool_call["id"]])
+            for tool_call in tool_calls
+        )
+    )
+    result = [
+        ToolMessage(content=str(observation), tool_call_id=tool_call["id"])
+        for tool_call, observation in zip(tool_calls, observations, strict=True)
+    ]
     return {"messages": result}
 
 
+# Próximo nó indexado por "a última mensagem tem tool calls"
+_NEXT: Final = ("__end__", "tool_node")
+
+
 def should_continue(state: MessagesState) -> Literal["tool_node", "__end__"]:
     """Decide se deve continuar o loop ou parar.
 
+    Se a LLM faz uma chamada para a tool, executa a ação; se não, para e
+    responde ao usuário.
+
     Args:
         state: Estado atual
 
     Returns:
         Próximo nó ou END
     """
-    messages = state["messages"]
-    last_message = messages[-1]
-
-    # Se a LLM faz uma chamada para a tool, então executa a ação
-    if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        return "tool_node"
-
-    # Se não, para e responde ao usuário
-    return "__end__"
+    last_message = state["messages"][-1]
+    return _NEXT[isinstance(last_message, AIMessage) and bool(last_message.tool_calls)]
 
 
 def create_agent():
@@ -110,9 +303,13 @@ def create_agent():
 
     agent_builder = StateGraph(MessagesState)
 
+    agent_builder.add_node("classify", classify)
     agent_builder.add_node("ollama_call", ollama_call)
     agent_builder.add_node("tool_node", tool_node)
-    agent_builder.add_edge(START, "ollama_call")
+    agent_builder.add_edge(START, "classify")
+    agent_builder.add_conditional_edges(
+        "classify", route_after_classify, ["ollama_call", END]
+    )
     agent_builder.add_conditional_edges(
         "ollama_call", should_continue, ["tool_node", END]
     )
@@ -120,16 +317,35 @@ def create_agent():
 
     logger.info("✓ Agente criado com sucesso")
 
-    return agent_builder.compile()
+    # O estado de cada conversa é mantido por thread_id (o id da sessão), então
+    # cada turno recebe apenas a nova mensagem do usuário
+    return agent_builder.compile(checkpointer=MemorySaver())
+
+
+@lru_cache(maxsize=1)
+def get_agent():
+    """Retorna o agente compilado, compartilhado por todas as sessões.
+
+    O estado de cada sessão fica no checkpointer, separado por thread_id, então
+    o grafo é compilado uma única vez no primeiro uso.
+
+    Returns:
+        Agente compilado
+    """
+    return create_agent()
 
 
 if __name__ == "__main__":
-    agent = create_agent()
+    agent = get_agent()
 
     messages = [HumanMessage(content="Add 3 and 4.")]
     logger.info("Testando agente com: Add 3 and 4.")
 
-    result = agent.invoke({"messages": messages})
+    result = asyncio.run(
+        agent.ainvoke(
+            {"messages": messages}, config={"configurable": {"thread_id": "teste"}}
+        )
+    )
 
     for msg in result["messages"]:
         if isinstance(msg, AIMessage):
@@ -3,11 +3,19 @@
 Carrega variáveis de ambiente e valida configurações usando Pydantic.
 """
 
+import textwrap
+from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+RetrievalType = Literal["similarity", "mmr", "similarity_score_threshold"]
+ChromaMode = Literal["http", "embedded"]
+HnswSpace = Literal["l2", "cosine", "ip"]
+
 
 class Config(BaseSettings):
     """Configurações da aplicação usando Pydantic BaseSettings."""
@@ -17,6 +25,7 @@ class Config(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
 
     # Diretórios
@@ -25,6 +34,12 @@ class Config(BaseSettings):
     log_dir: Path = Field(default_factory=lambda: Path(__file__).parent.parent / "logs")
 
     # Ollama
+    # As chamadas ao LLM e aos embeddings são assíncronas e podem ser feitas em
+    # paralelo por várias sessões. Para que o servidor Ollama as atenda de fato
+    # em paralelo, configure no ambiente do servidor:
+    #   OLLAMA_NUM_PARALLEL: requisições simultâneas por modelo carregado
+    #   OLLAMA_MAX_LOADED_MODELS: modelos mantidos em memória ao mesmo tempo
+    #     (LLM e modelo de embeddings)
     ollama_base_url: str = Field(
         default="http://localhost:11434", description="URL base do Ollama"
     )
@@ -32,6 +47,12 @@ class Config(BaseSettings):
     ollama_temperature: float = Field(
         default=0.0, ge=0.0, le=2.0, description="Temperatura do modelo"
     )
+    ollama_max_ctx: int = Field(
+        default=8192, gt=0, description="Contexto (num_ctx) fixo de toda chamada"
+    )
+    max_new_tokens: int = Field(
+        default=1024, gt=0, description="Máximo de tokens gerados por resposta"
+    )
 
     # Embeddings
     embedding_model: str = Field(
@@ -39,6 +60,13 @@ class Config(BaseSettings):
         description="Modelo de embeddings",
     )
 
+    embed_batch_size: int = Field(
+        default=32, gt=0, description="Chunks por requisição de embeddings"
+    )
+    query_embedding_cache_size: int = Field(
+        default=512, gt=0, description="Embeddings de queries mantidos em cache"
+    )
+
     # Processamento de Texto
     chunk_size: int = Field(
         default=1000, gt=0, description="Tamanho dos chunks de texto"
@@ -51,12 +79,58 @@ class Config(BaseSettings):
     retrieval_k: int = Field(
         default=5, gt=0, description="Número de documentos a recuperar"
     )
-    retrieval_type: str = Field(
+    retrieval_type: RetrievalType = Field(
         default="similarity", description="Tipo de busca no retrieval"
     )
 
+    # ChromaDB
+    # "http" conecta ao servidor do docker-compose; "embedded" roda o Chroma no
+    # próprio processo (sem serialização JSON/HTTP a cada add/query), gravando
+    # em chroma_persist_dir (relativo à raiz do projeto). Os dois modos não
+    # devem usar o mesmo diretório ao mesmo tempo.
+    chroma_mode: ChromaMode = Field(default="http", description="Modo do cliente")
+    chroma_host: str = Field(default="localhost", description="Host do servidor")
+    chroma_port: int = Field(default=9001, gt=0, description="Porta do servidor")
+    chroma_persist_dir: str = Field(
+        default="chroma-data", description="Diretório do Chroma embutido"
+    )
+
+    # Índice HNSW do ChromaDB. Métrica, M e ef_construction só valem na criação
+    # da coleção: mudá-los exige reindexar em uma coleção nova. O padrão l2 é
+    # a métrica das coleções criadas antes destes parâmetros existirem.
+    hnsw_space: HnswSpace = Field(default="l2", description="Métrica de distância")
+    hnsw_m: int = Field(default=16, gt=0, description="Vizinhos por nó do grafo")
+    hnsw_ef_construction: int = Field(
+        default=100, gt=0, description="Candidatos avaliados na construção"
+    )
+    hnsw_ef_search: int = Field(
+        default=16, gt=0, description="Candidatos avaliados em cada busca"
+    )
+
+    # Histórico de conversa
+    history_window: int = Field(
+        default=12, gt=0, description="Mensagens recentes mantidas após resumir"
+    )
+    history_summary_trigger: int = Field(
+        default=24, gt=0, description="Mensagens não resumidas que disparam o resumo"
+    )
+
+    # Cache semântico
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Similaridade de cosseno mínima para hit no cache semântico",
+    )
+    semantic_cache_ttl_s: int = Field(
+        default=3600, gt=0, description="Tempo de vida das entradas do cache (s)"
+    )
+    semantic_cache_max_entries: int = Field(
+        default=256, gt=0, description="Número máximo de entradas por sessão"
+    )
+
     # Logging
-    log_level: str = Field(default="INFO", description="Nível de logging")
+    log_level: LogLevel = Field(default="INFO", description="Nível de logging")
     log_file: str | None = Field(default=None, description="Arquivo de log")
 
     # System Message
@@ -84,20 +158,64 @@ class Config(BaseSettings):
             )
         return v
 
-    @field_validator("log_level")
+    @field_validator("hnsw_ef_search")
     @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        """Valida que o log_level é válido."""
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        v_upper = v.upper()
-        if v_upper not in valid_levels:
-            raise ValueError(f"log_level deve ser um de: {', '.join(valid_levels)}")
-        return v_upper
+    def validate_hnsw_ef_search(cls, v: int, info) -> int:
+        """Valida que hnsw_ef_search não é menor que retrieval_k."""
+        retrieval_k = info.data.get("retrieval_k", 5)
+        if v < retrieval_k:
+            raise ValueError(
+                f"hnsw_ef_search ({v}) deve ser maior ou igual a "
+                f"retrieval_k ({retrieval_k})"
+            )
+        return v
+
+    @field_validator("history_summary_trigger")
+    @classmethod
+    def validate_history_summary_trigger(cls, v: int, info) -> int:
+        """Valida que history_summary_trigger é maior que history_window."""
+        history_window = info.data.get("history_window", 12)
+        if v <= history_window:
+            raise ValueError(
+                f"history_summary_trigger ({v}) deve ser maior que "
+                f"history_window ({history_window})"
+            )
+        return v
+
+    @field_validator("system_message")
+    @classmethod
+    def validate_system_message(cls, v: str) -> str:
+        """Normaliza a indentação e as bordas da mensagem de sistema.
+
+        Mantém o prefixo do prompt idêntico entre chamadas, o que permite ao
+        Ollama reaproveitar o KV-cache do prefixo.
+        """
+        return textwrap.dedent(v).strip()
+
+    @field_validator("log_level", mode="before")
+    @classmethod
+    def normalize_log_level(cls, v):
+        """Aceita o log_level em qualquer caixa (validado pelo Literal)."""
+        return v.upper() if isinstance(v, str) else v
 
     def get_data_dir(self) -> Path:
         """Retorna o caminho completo do diretório de dados."""
         return self.base_dir / self.data_dir
 
+    def get_chroma_persist_dir(self) -> Path:
+        """Retorna o diretório do Chroma embutido, relativo à raiz do projeto.
+
+        Não depende do diretório de onde o Chainlit é iniciado; um caminho
+        absoluto é usado como está.
+        """
+        return self.base_dir.parent / self.chroma_persist_dir
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Config:
+    """Retorna a instância única (imutável) de configuração."""
+    return Config()
+
 
 # Instância global de configuração
-settings = Config()
+settings = get_settings()
@@ -1,10 +1,13 @@
 """Interface Chainlit para o Simple RAG."""
 
+from typing import Any
+
 import chainlit as cl
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
-from simple_rag.agent.agent import create_agent
+from simple_rag.agent.agent import SUMMARY_TAG, get_agent
 from simple_rag.config.config import settings
+from simple_rag.tools.retriever import semantic_cache
 from simple_rag.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -16,16 +19,14 @@ async def start():
     try:
         logger.info("Inicializando agente para nova sessão...")
 
-        # Cria o agente
-        agent = create_agent()
+        # Garante que o agente compartilhado está compilado
+        get_agent()
 
         # Get vectorstore instance for PDF uploads
         from simple_rag.tools.retriever import vectorstore
 
-        # Armazena o agente E o vectorstore na sessão do usuário
-        cl.user_session.set("agent", agent)
+        # Armazena o vectorstore na sessão do usuário
         cl.user_session.set("vectorstore", vectorstore)
-        cl.user_session.set("message_history", [])
 
         # Mensagem de boas-vindas
         welcome_message = f""" # Bem-vindo ao seu Q&A Agent ! 🤓
@@ -91,18 +92,28 @@ async def main(message: cl.Message):
                     await processing_msg.update()
 
                 # Process PDFs with progress updates
-                total_chunks, errors = await process_pdf_files(
+                total_chunks, errors, skipped = await process_pdf_files(
                     pdf_files, vectorstore, progress_callback=update_progress
                 )
 
+                # Novos documentos tornam resultados em cache desatualizados
+                if total_chunks:
+                    semantic_cache.clear()
+
                 # Provide feedback
+                processed = len(pdf_files) - len(errors) - len(skipped)
                 if errors:
-                    content = f"✓ Processed {len(pdf_files) - len(errors)} PDF(s) successfully. {total_chunks} chunks added.\n\n"
+                    content = f"✓ Processed {processed} PDF(s) successfully. {total_chunks} chunks added.\n\n"
                     content += f"⚠️ {len(errors)} file(s) failed:\n" + "\n".join(
                         f"• {err}" for err in errors
                     )
                 else:
-                    content = f"✓ Successfully processed {len(pdf_files)} PDF file(s). {total_chunks} chunks added to knowledge base."
+                    content = f"✓ Successfully processed {processed} PDF file(s). {total_chunks} chunks added to knowledge base."
+                if skipped:
+                    content += (
+                        f"\n\n⏭️ {len(skipped)} file(s) already indexed, skipped:\n"
+                        + "\n".join(f"• {msg}" for msg in skipped)
+                    )
 
                 processing_msg.content = content
                 await processing_msg.update()
@@ -112,22 +123,13 @@ async def main(message: cl.Message):
                 )
                 return
 
-        # Recupera o agente da sessão
-        agent = cl.user_session.get("agent")
-        message_history = cl.user_session.get("message_history", [])
-
-        if not agent:
-            await cl.Message(
-                content="❌ Agente não inicializado. Recarregue a página."
-            ).send()
-            return
+        # Agente compartilhado; o histórico fica no checkpointer, por sessão
+        agent = get_agent()
+        thread_config = {"configurable": {"thread_id": cl.user_session.get("id")}}
 
         # Cria mensagem para o agente
         user_message = HumanMessage(content=message.content)
 
-        # Adiciona ao histórico
-        message_history.append(user_message)
-
         # Mensagem de processamento
         processing_msg = cl.Message(content="")
         await processing_msg.send()
@@ -135,14 +137,39 @@ async def main(message: cl.Message):
         # Processa com o agente
         logger.debug(f"Processando mensagem: {message.content}")
 
-        # Invoca o agente
-        result = agent.invoke({"messages": message_history})
+        # Executa o agente transmitindo os tokens do LLM conforme são gerados
+        result: dict[str, Any] = {"messages": []}
+        async for event in agent.astream_events(
+            {"messages": [user_message]}, config=thread_config, version="v2"
+        ):
+            kind = event["event"]
+            if (
+                kind == "on_chat_model_stream"
+                and event["metadata"].get("langgraph_node") == "ollama_call"
+                and SUMMARY_TAG not in event["tags"]
+            ):
+                token = event["data"]["chunk"].content
+                if token:
+                    await processing_msg.stream_token(token)
+            elif kind == "on_tool_start":
+                await processing_msg.stream_token(f"🔧 **{event['name']}**\n\n")
+            elif kind == "on_chain_end" and not event["parent_ids"]:
+                # Estado final do grafo
+                result = event["data"]["output"]
 
         # Processa as respostas
         response_content = ""
         tool_calls_info = []
 
-        for msg in result["messages"]:
+        # Apenas as mensagens geradas neste turno (após a pergunta do usuário)
+        messages = result["messages"]
+        turn_start = len(messages)
+        while turn_start > 0 and not isinstance(
+            messages[turn_start - 1], HumanMessage
+        ):
+            turn_start -= 1
+
+        for msg in messages[turn_start:]:
             if isinstance(msg, AIMessage):
                 # Se há tool calls, mostra informação
                 if msg.tool_calls:
@@ -155,13 +182,12 @@ async def main(message: cl.Message):
                 # Resposta final
                 if msg.content:
                     response_content = msg.content
-                    message_history.append(msg)
 
             elif isinstance(msg, ToolMessage):
                 # Log de tool messages
                 logger.debug(f"Tool result: {msg.content[:100]}...")
 
-        # Atualiza a mensagem com a resposta
+        # Substitui o texto transmitido pela versão final consolidada
         if tool_calls_info:
             tools_section = "\n".join(tool_calls_info)
             final_content = f"{tools_section}\n\n{response_content}"
@@ -171,9 +197,6 @@ async def main(message: cl.Message):
         processing_msg.content = final_content
         await processing_msg.update()
 
-        # Atualiza o histórico na sessão
-        cl.user_session.set("message_history", message_history)
-
         # Log de estatísticas
         llm_calls = result.get("llm_calls", 0)
         logger.info(f"✓ Resposta gerada (LLM calls: {llm_calls})")
@@ -187,6 +210,8 @@ async def main(message: cl.Message):
 @cl.on_chat_end
 async def end():
     """Cleanup quando o chat termina."""
+    # Descarta o estado da conversa guardado no checkpointer
+    await get_agent().checkpointer.adelete_thread(cl.user_session.get("id"))
     logger.info("Sessão encerrada")
 
 
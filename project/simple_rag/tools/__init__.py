@@ -1,6 +1,14 @@
 """Ferramentas disponíveis para os agentes."""
 
-from simple_rag.tools.calculator import add, multiply
-from simple_rag.tools.retriever import retrieve_context
+from simple_rag.tools.retriever import embed_queries, retrieve_context
 
-__all__ = ["add", "multiply", "retrieve_context"]
+__all__ = ["add", "embed_queries", "multiply", "retrieve_context"]
+
+
+def __getattr__(name: str):
+    """Importa as ferramentas de cálculo apenas quando usadas."""
+    if name in ("add", "multiply"):
+        from simple_rag.tools import calculator  # noqa: PLC0415
+
+        return getattr(calculator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
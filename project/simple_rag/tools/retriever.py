@@ -1,23 +1,148 @@
 """Ferramenta de recuperação de documentos."""
 
+from collections import OrderedDict
+from typing import Annotated, Final
+
+import chainlit as cl
 from langchain.tools import tool
+from langchain_core.tools import InjectedToolArg
 
+from simple_rag.config.config import settings
 from simple_rag.utils.logger import setup_logger
+from simple_rag.utils.semantic_cache import SemanticCache
 from simple_rag.utils.vectorstore import get_vectorstore
 
 logger = setup_logger(__name__)
-vectorstore = get_vectorstore()
+
+RETRIEVAL_K: Final[int] = settings.retrieval_k
+QUERY_EMBEDDING_CACHE_SIZE: Final[int] = settings.query_embedding_cache_size
+
+# Exact-text LRU of query embeddings: repeated queries skip the Ollama request
+_query_embeddings: OrderedDict[str, list[float]] = OrderedDict()
+
+semantic_cache = SemanticCache(
+    threshold=settings.semantic_cache_threshold,
+    ttl_s=settings.semantic_cache_ttl_s,
+    max_entries=settings.semantic_cache_max_entries,
+)
+
+
+def _vs():
+    """Open the Chroma vectorstore on first use (get_vectorstore caches it)."""
+    return get_vectorstore()
+
+
+def __getattr__(name: str):
+    """Keep `from simple_rag.tools.retriever import vectorstore` working."""
+    if name == "vectorstore":
+        return _vs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _session_namespace() -> str:
+    """Return the current Chainlit session id, or "default" outside a session."""
+    try:
+        return cl.user_session.get("id") or "default"
+    except Exception:
+        return "default"
+
+
+def _source_header(doc) -> str:
+    """Return the "Source: ..." header pre-formatted at ingest time.
+
+    Documents indexed before "_fmt" existed fall back to formatting it here.
+    """
+    return doc.metadata.get("_fmt") or f"Source: {doc.metadata}"
+
+
+def _remember_embedding(query: str, embedding: list[float]) -> None:
+    """Store a query embedding, evicting the least recently used ones."""
+    _query_embeddings[query] = embedding
+    _query_embeddings.move_to_end(query)
+    while len(_query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+        _query_embeddings.popitem(last=False)
+
+
+def _cached_embedding(query: str) -> list[float] | None:
+    """Return the cached embedding of this exact query text, if any."""
+    embedding = _query_embeddings.get(query)
+    if embedding is not None:
+        _query_embeddings.move_to_end(query)
+    return embedding
+
+
+async def embed_query(query: str) -> list[float]:
+    """Embed a single query, reusing the embedding of an identical earlier one.
+
+    Args:
+        query: Query string to embed.
+
+    Returns:
+        The query embedding.
+    """
+    embedding = _cached_embedding(query)
+    if embedding is None:
+        embedding = await _vs().embeddings.aembed_query(query)
+        _remember_embedding(query, embedding)
+    return embedding
+
+
+async def embed_queries(queries: list[str]) -> list[list[float]]:
+    """Embed several queries with a single embeddings request.
+
+    Queries already in the embedding cache are not sent again.
+
+    Args:
+        queries: Query strings to embed.
+
+    Returns:
+        One embedding per query, in the same order.
+    """
+    found: dict[str, list[float]] = {}
+    missing: list[str] = []
+    for query in dict.fromkeys(queries):
+        embedding = _cached_embedding(query)
+        if embedding is None:
+            missing.append(query)
+        else:
+            found[query] = embedding
+    if missing:
+        vectors = await _vs().embeddings.aembed_documents(missing)
+        for query, embedding in zip(missing, vectors, strict=True):
+            found[query] = embedding
+            _remember_embedding(query, embedding)
+    return [found[query] for query in queries]
 
 
 @tool(response_format="content_and_artifact")
-def retrieve_context(query: str):
+async def retrieve_context(
+    query: str,
+    embedding: Annotated[list[float] | None, InjectedToolArg] = None,
+):
     """Retriever to search for private information in a vectorstore."""
+    namespace = _session_namespace()
+    # `embedding` is injected by the agent (hidden from the LLM schema) when the
+    # query was already embedded as part of a batch
+    query_embedding = embedding or await embed_query(query)
+
+    cached = semantic_cache.lookup(query_embedding, namespace=namespace)
+    if cached is not None:
+        logger.info(f"⚡ Semantic cache HIT for query: '{query[:100]}...'")
+        return cached
+
     logger.info(f"🔍 Vectorstore READ: Searching for query: '{query[:100]}...'")
-    retrieved_docs = vectorstore.similarity_search(query, k=4)
+    retrieved_docs = await _vs().asimilarity_search_by_vector(
+        query_embedding, k=RETRIEVAL_K
+    )
     logger.info(
         f"✓ Vectorstore READ completed: Retrieved {len(retrieved_docs)} document(s)"
     )
     serialized = "\n\n".join(
-        f"Source: {doc.metadata}\nContent: {doc.page_content}" for doc in retrieved_docs
+        [
+            f"{_source_header(doc)}\nContent: {doc.page_content}"
+            for doc in retrieved_docs
+        ]
     )
-    return serialized, retrieved_docs
+    result = serialized, retrieved_docs
+    semantic_cache.store(query_embedding, result, namespace=namespace)
+    return result
@@ -6,6 +6,116 @@ como CPF, RG, CEP, email e números de telefone em strings ou blocos de texto.
 
 import re
 from collections.abc import Callable
+from functools import lru_cache, partial
+
+# Tamanho máximo das sequências de máscara pré-construídas por mask_char
+_MASK_CACHE_SIZE = 64
+
+# Padrões compilados uma única vez, no import do módulo
+# Nos formatos fixos, os grupos capturam as partes visíveis referenciadas pelos
+# templates de _mask_templates
+_CPF_FORMATTED_RE = re.compile(r"\b(\d{3})\.\d{3}\.\d{3}-(\d{2})\b")
+_CPF_PLAIN_RE = re.compile(r"\b(\d{3})\d{5}(\d{3})\b")
+_RG_FORMATTED_RE = re.compile(r"\b(\d{2})\.\d{3}\.\d{3}-([\dXx])\b")
+_RG_PLAIN_RE = re.compile(r"\b(\d{2})\d{5}(\d{2})\b")
+_CEP_FORMATTED_RE = re.compile(r"\b(\d{5})-\d{3}\b")
+_CEP_PLAIN_RE = re.compile(r"\b(\d{5})\d{3}\b")
+# O usuário inteiro é casado a partir da primeira fronteira de palavra, mesmo
+# quando curto: assim um email curto é consumido e o scan não recomeça no meio
+# de um texto com vários "@" (ex.: "386@mail.com@mail.com")
+_EMAIL_RE = re.compile(r"\b([a-zA-Z0-9._%+-]+)(@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b")
+_PHONE_FULL_RE = re.compile(r"\(\d{2}\)\s*\d{4,5}-\d{4}")
+_PHONE_SPACE_RE = re.compile(r"\b\d{2}\s+\d{4,5}-\d{4}\b")
+_PHONE_PLAIN_11_RE = re.compile(r"\b\d{11}\b")
+_PHONE_PLAIN_10_RE = re.compile(r"\b\d{10}\b")
+# Os quatro formatos de telefone numa única alternação, identificados por
+# match.lastgroup
+_PHONE_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern.pattern})"
+        for name, pattern in (
+            ("full", _PHONE_FULL_RE),
+            ("space", _PHONE_SPACE_RE),
+            ("plain_11", _PHONE_PLAIN_11_RE),
+            ("plain_10", _PHONE_PLAIN_10_RE),
+        )
+    )
+)
+# Pré-filtros baratos de mask_all_pii: sem dígitos, "@" ou "Nome:" no texto,
+# as passadas correspondentes não teriam o que mascarar
+_DIGIT_RE = re.compile(r"\d")
+_NAME_ANCHOR_RE = re.compile(r"nome:", re.IGNORECASE)
+# Sequências de 8 a 11 dígitos (CEP, RG, telefone fixo, CPF/celular) numa única
+# passada de mask_all_pii
+_PLAIN_DIGITS_RE = re.compile(r"\b\d{8,11}\b")
+# Palavras inteiras que, logo antes de 11 dígitos, indicam celular em vez de
+# CPF (não casam dentro de "hotel", "parcela", "Estelionato"...)
+_PHONE_CONTEXT_RE = re.compile(
+    r"\b(?:tel(?:efone)?|fone|cel(?:ular)?)\b", re.IGNORECASE
+)
+_CPF_CONTEXT_RE = re.compile(r"\bcpf\b", re.IGNORECASE)
+_PHONE_CONTEXT_WINDOW = 15
+_BIRTH_DATE_SLASH_RE = re.compile(r"\b\d{2}/\d{2}/\d{4}\b")
+_BIRTH_DATE_DASH_RE = re.compile(r"\b\d{2}-\d{2}-\d{4}\b")
+_BIRTH_DATE_DOT_RE = re.compile(r"\b\d{2}\.\d{2}\.\d{4}\b")
+# Prontuário: palavras-chave seguidas de números, numa única alternação
+_PRONTUARIO_RE = re.compile(
+    r"((?:Prontuário|Pront\.?|Registro|Nº do prontuário)[:\s]+)(\d{6,10})\b",
+    re.IGNORECASE,
+)
+# Preposições que devem permanecer visíveis nos nomes
+_PREPOSITIONS = frozenset(("de", "da", "do", "dos", "das", "e"))
+# Captura "Nome: " seguido do nome completo até o final da linha
+_NAME_RE = re.compile(
+    r"(Nome:\s*)([A-Za-zÀ-ÿ ]+?)(?=\n|$)", re.IGNORECASE | re.MULTILINE
+)
+
+
+@lru_cache(maxsize=8)
+def _mask_strings(mask_char: str) -> tuple[str, ...]:
+    """Retorna as sequências de mask_char de tamanho 0 a _MASK_CACHE_SIZE."""
+    return tuple(mask_char * size for size in range(_MASK_CACHE_SIZE + 1))
+
+
+@lru_cache(maxsize=8)
+def _mask_templates(mask_char: str) -> dict[str, str]:
+    """Retorna os templates de substituição dos formatos de tamanho fixo.
+
+    Com um template no lugar de um callback, o re.sub monta o resultado em C,
+    sem chamar uma função Python por ocorrência.
+    """
+    # Barras invertidas em mask_char devem ser literais no template
+    mask = mask_char.replace("\\", "\\\\")
+    return {
+        # Mantém 123.XXX.XXX-45 (primeiros 3 e últimos 2)
+        "cpf_formatted": rf"\g<1>.{mask * 3}.{mask * 3}-\g<2>",
+        # Mantém 123XXXXX789 (primeiros 3 e últimos 3)
+        "cpf_plain": rf"\g<1>{mask * 5}\g<2>",
+        # Mantém 12.XXX.XXX-9 (2 primeiros dígitos e o verificador, "9" ou "X")
+        "rg_formatted": rf"\g<1>.{mask * 3}.{mask * 3}-\g<2>",
+        # Mantém 12XXXXX89 (primeiros 2 e últimos 2)
+        "rg_plain": rf"\g<1>{mask * 5}\g<2>",
+        # Mantém 12345-XXX (primeiros 5 e mascara os 3 últimos)
+        "cep_formatted": rf"\g<1>-{mask * 3}",
+        # Mantém 12345XXX (primeiros 5 e mascara os 3 últimos)
+        "cep_plain": rf"\g<1>{mask * 3}",
+        "birth_date_slash": f"{mask * 2}/{mask * 2}/{mask * 4}",
+        "birth_date_dash": f"{mask * 2}-{mask * 2}-{mask * 4}",
+        "birth_date_dot": f"{mask * 2}.{mask * 2}.{mask * 4}",
+    }
+
+
+def _mask_run(masks: tuple[str, ...], size: int) -> str:
+    """Retorna mask_char repetido size vezes, a partir das sequências prontas."""
+    if size < len(masks):
+        return masks[size]
+    return masks[1] * size
+
+
+def _mask_cpf_plain(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    cpf = match.group(0)
+    # Mantém 123XXXXX789 (primeiros 3 e últimos 3)
+    return f"{cpf[:3]}{masks[5]}{cpf[-3:]}"
 
 
 def mask_cpf(text: str, mask_char: str = "*") -> str:
@@ -28,28 +138,22 @@ def mask_cpf(text: str, mask_char: str = "*") -> str:
         >>> mask_cpf("CPF: 12345678900")
         "CPF: ***********"
     """
-
+    templates = _mask_templates(mask_char)
     # CPF com pontuação: XXX.XXX.XXX-XX -> mantém primeiro e último bloco
-    def mask_formatted(match):
-        cpf = match.group(0)
-        # Mantém 123.XXX.XXX-45 (primeiros 3 e últimos 2)
-        return f"{cpf[:3]}.{mask_char * 3}.{mask_char * 3}-{cpf[-2:]}"
-
-    pattern_formatted = r"\b\d{3}\.\d{3}\.\d{3}-\d{2}\b"
-    text = re.sub(pattern_formatted, mask_formatted, text)
+    text = _CPF_FORMATTED_RE.sub(templates["cpf_formatted"], text)
 
     # CPF sem pontuação: 11 dígitos seguidos -> mantém 3 primeiros e 3 últimos
-    def mask_plain(match):
-        cpf = match.group(0)
-        # Mantém 123XXXXX789 (primeiros 3 e últimos 3)
-        return f"{cpf[:3]}{mask_char * 5}{cpf[-3:]}"
-
-    pattern_plain = r"\b\d{11}\b"
-    text = re.sub(pattern_plain, mask_plain, text)
+    text = _CPF_PLAIN_RE.sub(templates["cpf_plain"], text)
 
     return text
 
 
+def _mask_rg_plain(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    rg = match.group(0)
+    # Mantém 12XXXXX89 (primeiros 2 e últimos 2)
+    return f"{rg[:2]}{masks[5]}{rg[-2:]}"
+
+
 def mask_rg(text: str, mask_char: str = "*") -> str:
     """Mascara números de RG no texto, mantendo os 2 primeiros e 2 últimos dígitos.
 
@@ -70,32 +174,22 @@ def mask_rg(text: str, mask_char: str = "*") -> str:
         >>> mask_rg("RG: 123456789")
         "RG: 12*****89"
     """
-
+    templates = _mask_templates(mask_char)
     # RG com pontuação: XX.XXX.XXX-X -> mantém primeiros 2 e último dígito
-    def mask_formatted(match):
-        rg = match.group(0)
-        # Mantém 12.XXX.XXX-9 (primeiros 2 e último 1)
-        # Como o RG tem formato XX.XXX.XXX-X, vamos manter os 2 primeiros dígitos
-        # e o dígito verificador (último)
-        first_two = rg[:2]  # "12"
-        last_char = rg[-1]  # "9" ou "X"
-        return f"{first_two}.{mask_char * 3}.{mask_char * 3}-{last_char}"
-
-    pattern_formatted = r"\b\d{2}\.\d{3}\.\d{3}-[\dXx]\b"
-    text = re.sub(pattern_formatted, mask_formatted, text)
+    text = _RG_FORMATTED_RE.sub(templates["rg_formatted"], text)
 
     # RG sem pontuação: 9 dígitos -> mantém 2 primeiros e 2 últimos
-    def mask_plain(match):
-        rg = match.group(0)
-        # Mantém 12XXXXX89 (primeiros 2 e últimos 2)
-        return f"{rg[:2]}{mask_char * 5}{rg[-2:]}"
-
-    pattern_plain = r"\b\d{9}\b"
-    text = re.sub(pattern_plain, mask_plain, text)
+    text = _RG_PLAIN_RE.sub(templates["rg_plain"], text)
 
     return text
 
 
+def _mask_cep_plain(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    cep = match.group(0)
+    # Mantém 12345XXX (primeiros 5 e mascara os 3 últimos)
+    return f"{cep[:5]}{masks[3]}"
+
+
 def mask_cep(text: str, mask_char: str = "*") -> str:
     """Mascara os 3 últimos números de CEPs no texto.
 
@@ -116,28 +210,28 @@ def mask_cep(text: str, mask_char: str = "*") -> str:
         >>> mask_cep("CEP: 12345678")
         "CEP: 12345***"
     """
-
+    templates = _mask_templates(mask_char)
     # CEP com hífen: XXXXX-XXX -> mantém XXXXX e mascara os 3 últimos
-    def mask_formatted(match):
-        cep = match.group(0)
-        # Mantém 12345-XXX (primeiros 5 e mascara os 3 últimos)
-        return f"{cep[:5]}-{mask_char * 3}"
-
-    pattern_formatted = r"\b\d{5}-\d{3}\b"
-    text = re.sub(pattern_formatted, mask_formatted, text)
+    text = _CEP_FORMATTED_RE.sub(templates["cep_formatted"], text)
 
     # CEP sem hífen: 8 dígitos -> mantém os 5 primeiros e mascara os 3 últimos
-    def mask_plain(match):
-        cep = match.group(0)
-        # Mantém 12345XXX (primeiros 5 e mascara os 3 últimos)
-        return f"{cep[:5]}{mask_char * 3}"
-
-    pattern_plain = r"\b\d{8}\b"
-    text = re.sub(pattern_plain, mask_plain, text)
+    text = _CEP_PLAIN_RE.sub(templates["cep_plain"], text)
 
     return text
 
 
+def _mask_email_match(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    local_part = match.group(1)  # Parte antes do @
+
+    # Se o usuário tiver 4 caracteres ou menos, não mascara
+    if len(local_part) <= 4:
+        return match.group(0)
+
+    # Mantém os 4 primeiros caracteres e mascara o resto
+    domain_part = match.group(2)  # Parte depois do @ (incluindo @)
+    return local_part[:4] + _mask_run(masks, len(local_part) - 4) + domain_part
+
+
 def mask_email(text: str, mask_char: str = "*") -> str:
     """Mascara endereços de email no texto.
 
@@ -158,25 +252,66 @@ def mask_email(text: str, mask_char: str = "*") -> str:
         >>> mask_email("Email: jo@example.com")
         "Email: jo@example.com"
     """
-    pattern = r"\b([a-zA-Z0-9._%+-]+)(@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b"
+    masks = _mask_strings(mask_char)
+    text = _EMAIL_RE.sub(partial(_mask_email_match, masks), text)
+
+    return text
 
-    def replace_email(match):
-        local_part = match.group(1)  # Parte antes do @
-        domain_part = match.group(2)  # Parte depois do @ (incluindo @)
 
-        # Se o usuário tiver 4 caracteres ou menos, não mascara
-        if len(local_part) <= 4:
-            return local_part + domain_part
+def _is_mobile(phone: str) -> bool:
+    """Indica se o número termina em XXXXX-XXXX (5 dígitos antes do hífen)."""
+    return phone[-10].isdigit()
 
-        # Mantém os 4 primeiros caracteres e mascara o resto
-        visible_part = local_part[:4]
-        masked_part = mask_char * (len(local_part) - 4)
 
-        return visible_part + masked_part + domain_part
+def _mask_phone_full(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    phone = match.group(0)
+    # O padrão termina sempre em XXXX-XXXX ou XXXXX-XXXX
+    last_four = phone[-4:]
 
-    text = re.sub(pattern, replace_email, text)
+    if _is_mobile(phone):  # Celular: (XX) XXXXX-XXXX
+        return f"({masks[2]}) {masks[5]}-{last_four}"
+    else:  # Fixo: (XX) XXXX-XXXX
+        return f"({masks[2]}) {masks[4]}-{last_four}"
+
+
+def _mask_phone_space(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    phone = match.group(0)
+    last_four = phone[-4:]
+
+    if _is_mobile(phone):  # Celular: XX XXXXX-XXXX
+        return f"{masks[2]} {masks[5]}-{last_four}"
+    else:  # Fixo: XX XXXX-XXXX
+        return f"{masks[2]} {masks[4]}-{last_four}"
+
+
+def _mask_phone_plain_11(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    phone = match.group(0)
+    last_four = phone[-4:]
+    return f"{masks[7]}{last_four}"
+
+
+def _mask_phone_plain_10(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    phone = match.group(0)
+    last_four = phone[-4:]
+    return f"{masks[6]}{last_four}"
 
-    return text
+
+# Callbacks do re.sub recebem as sequências de máscara prontas e o match
+_Masker = Callable[[tuple[str, ...], re.Match[str]], str]
+
+_PHONE_MASKERS: dict[str, _Masker] = {
+    "full": _mask_phone_full,
+    "space": _mask_phone_space,
+    "plain_11": _mask_phone_plain_11,
+    "plain_10": _mask_phone_plain_10,
+}
+
+
+def _mask_phone_match(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    # Toda alternativa de _PHONE_RE é um grupo nomeado
+    group = match.lastgroup
+    assert group is not None
+    return _PHONE_MASKERS[group](masks, match)
 
 
 def mask_phone(text: str, mask_char: str = "*") -> str:
@@ -205,53 +340,12 @@ def mask_phone(text: str, mask_char: str = "*") -> str:
         >>> mask_phone("Tel: 11987654321")
         "Tel: *******4321"
     """
-
-    # Telefone com parênteses e hífen: (XX) XXXXX-XXXX ou (XX) XXXX-XXXX
-    def replace_phone_full(match):
-        phone = match.group(0)
-        # Extrair apenas os dígitos
-        digits = re.sub(r"\D", "", phone)
-        last_four = digits[-4:]
-
-        if len(digits) == 11:  # Celular: (XX) XXXXX-XXXX
-            return f"({mask_char * 2}) {mask_char * 5}-{last_four}"
-        else:  # Fixo: (XX) XXXX-XXXX
-            return f"({mask_char * 2}) {mask_char * 4}-{last_four}"
-
-    pattern_full = r"\(\d{2}\)\s*\d{4,5}-\d{4}"
-    text = re.sub(pattern_full, replace_phone_full, text)
-
-    # Telefone sem parênteses: XX XXXXX-XXXX ou XX XXXX-XXXX
-    def replace_phone_space(match):
-        phone = match.group(0)
-        digits = re.sub(r"\D", "", phone)
-        last_four = digits[-4:]
-
-        if len(digits) == 11:  # Celular: XX XXXXX-XXXX
-            return f"{mask_char * 2} {mask_char * 5}-{last_four}"
-        else:  # Fixo: XX XXXX-XXXX
-            return f"{mask_char * 2} {mask_char * 4}-{last_four}"
-
-    pattern_space = r"\b\d{2}\s+\d{4,5}-\d{4}\b"
-    text = re.sub(pattern_space, replace_phone_space, text)
-
-    # Telefone apenas números: 11 dígitos
-    def replace_plain_11(match):
-        phone = match.group(0)
-        last_four = phone[-4:]
-        return f"{mask_char * 7}{last_four}"
-
-    pattern_plain_11 = r"\b\d{11}\b"
-    text = re.sub(pattern_plain_11, replace_plain_11, text)
-
-    # Telefone apenas números: 10 dígitos
-    def replace_plain_10(match):
-        phone = match.group(0)
-        last_four = phone[-4:]
-        return f"{mask_char * 6}{last_four}"
-
-    pattern_plain_10 = r"\b\d{10}\b"
-    text = re.sub(pattern_plain_10, replace_plain_10, text)
+    masks = _mask_strings(mask_char)
+    # Numa só passada:
+    # - com parênteses e hífen: (XX) XXXXX-XXXX ou (XX) XXXX-XXXX
+    # - sem parênteses: XX XXXXX-XXXX ou XX XXXX-XXXX
+    # - apenas números: 11 ou 10 dígitos
+    text = _PHONE_RE.sub(partial(_mask_phone_match, masks), text)
 
     return text
 
@@ -277,25 +371,28 @@ def mask_birth_date(text: str, mask_char: str = "*") -> str:
         >>> mask_birth_date("Nascido em 01-05-1980")
         "Nascido em **-**-****"
     """
+    templates = _mask_templates(mask_char)
     # Data com barra: DD/MM/AAAA
-    pattern_slash = r"\b\d{2}/\d{2}/\d{4}\b"
-    text = re.sub(
-        pattern_slash, f"{mask_char * 2}/{mask_char * 2}/{mask_char * 4}", text
-    )
+    text = _BIRTH_DATE_SLASH_RE.sub(templates["birth_date_slash"], text)
 
     # Data com hífen: DD-MM-AAAA
-    pattern_dash = r"\b\d{2}-\d{2}-\d{4}\b"
-    text = re.sub(
-        pattern_dash, f"{mask_char * 2}-{mask_char * 2}-{mask_char * 4}", text
-    )
+    text = _BIRTH_DATE_DASH_RE.sub(templates["birth_date_dash"], text)
 
     # Data com ponto: DD.MM.AAAA
-    pattern_dot = r"\b\d{2}\.\d{2}\.\d{4}\b"
-    text = re.sub(pattern_dot, f"{mask_char * 2}.{mask_char * 2}.{mask_char * 4}", text)
+    text = _BIRTH_DATE_DOT_RE.sub(templates["birth_date_dot"], text)
 
     return text
 
 
+def _mask_prontuario_number(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    prefix = match.group(1)
+    number = match.group(2)
+    # Mantém os últimos 3 dígitos
+    last_three = number[-3:]
+    masked_part = _mask_run(masks, len(number) - 3)
+    return f"{prefix}{masked_part}{last_three}"
+
+
 def mask_prontuario(text: str, mask_char: str = "*") -> str:
     """Mascara números de prontuário no texto, mantendo os 3 últimos dígitos visíveis.
 
@@ -316,29 +413,50 @@ def mask_prontuario(text: str, mask_char: str = "*") -> str:
         >>> mask_prontuario("Pront. 123456789")
         "Pront. ******789"
     """
-    # Padrão para detectar prontuário com contexto
-    # Busca por palavras-chave seguidas de números
-    patterns = [
-        r"(Prontuário[:\s]+)(\d{6,10})\b",
-        r"(Pront\.?[:\s]+)(\d{6,10})\b",
-        r"(Registro[:\s]+)(\d{6,10})\b",
-        r"(Nº do prontuário[:\s]+)(\d{6,10})\b",
-    ]
-
-    def mask_number(match):
-        prefix = match.group(1)
-        number = match.group(2)
-        # Mantém os últimos 3 dígitos
-        last_three = number[-3:]
-        masked_part = mask_char * (len(number) - 3)
-        return f"{prefix}{masked_part}{last_three}"
-
-    for pattern in patterns:
-        text = re.sub(pattern, mask_number, text, flags=re.IGNORECASE)
+    masks = _mask_strings(mask_char)
+    # Padrão de prontuário com contexto: palavras-chave seguidas de números
+    text = _PRONTUARIO_RE.sub(partial(_mask_prontuario_number, masks), text)
 
     return text
 
 
+def _is_phone_context(match: re.Match[str]) -> bool:
+    """Indica se os dígitos são precedidos por uma palavra-chave de telefone.
+
+    Considera a palavra-chave mais próxima dentro da janela: "CPF" vence um
+    "Tel" que apareça antes dele.
+    """
+    end = match.start()
+    start = max(0, end - _PHONE_CONTEXT_WINDOW)
+    # A busca com pos/endpos ainda vê o caractere antes da janela, então uma
+    # palavra cortada no início da janela não conta como palavra inteira
+    phone_pos = _last_start(_PHONE_CONTEXT_RE, match.string, start, end)
+    return phone_pos > _last_start(_CPF_CONTEXT_RE, match.string, start, end)
+
+
+def _last_start(pattern: re.Pattern[str], text: str, start: int, end: int) -> int:
+    """Posição do último match de pattern em text[start:end], ou -1."""
+    last = -1
+    for found in pattern.finditer(text, start, end):
+        last = found.start()
+    return last
+
+
+def _mask_plain_digits(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    """Mascara uma sequência de dígitos conforme o tamanho (e o contexto)."""
+    size = len(match.group(0))
+    if size == 8:  # CEP
+        return _mask_cep_plain(masks, match)
+    if size == 9:  # RG
+        return _mask_rg_plain(masks, match)
+    if size == 10:  # Telefone fixo
+        return _mask_phone_plain_10(masks, match)
+    # 11 dígitos: celular quando precedido de "Tel"/"Fone"/"Cel", senão CPF
+    if _is_phone_context(match):
+        return _mask_phone_plain_11(masks, match)
+    return _mask_cpf_plain(masks, match)
+
+
 def mask_all_pii(
     text: str,
     mask_char: str = "*",
@@ -359,18 +477,42 @@ def mask_all_pii(
         >>> mask_all_pii(text)
         "CPF: ***.***.***.**, Email: ****@***.com, Tel: (**) *****-****"
     """
+    masks = _mask_strings(mask_char)
+    templates = _mask_templates(mask_char)
     # Aplica todas as máscaras na ordem
     masked_text = text
 
-    # Ordem de aplicação: mais específicos primeiro para evitar conflitos
-    masked_text = mask_name(masked_text, mask_char)
-    masked_text = mask_birth_date(masked_text, mask_char)
-    masked_text = mask_prontuario(masked_text, mask_char)
-    masked_text = mask_cpf(masked_text, mask_char)
-    masked_text = mask_rg(masked_text, mask_char)
-    masked_text = mask_email(masked_text, mask_char)
-    masked_text = mask_phone(masked_text, mask_char)
-    masked_text = mask_cep(masked_text, mask_char)
+    # Ordem de aplicação: mais específicos primeiro para evitar conflitos.
+    # A maioria dos chunks não tem PII: pula as passadas que não podem casar
+    has_digits = _DIGIT_RE.search(masked_text) is not None
+
+    if _NAME_ANCHOR_RE.search(masked_text):
+        masked_text = mask_name(masked_text, mask_char)
+
+    if has_digits:
+        masked_text = mask_birth_date(masked_text, mask_char)
+        masked_text = mask_prontuario(masked_text, mask_char)
+
+        # Formatos com pontuação
+        masked_text = _CPF_FORMATTED_RE.sub(templates["cpf_formatted"], masked_text)
+        masked_text = _RG_FORMATTED_RE.sub(templates["rg_formatted"], masked_text)
+
+    if "@" in masked_text:
+        masked_text = mask_email(masked_text, mask_char)
+
+    if has_digits:
+        masked_text = _PHONE_FULL_RE.sub(
+            partial(_mask_phone_full, masks), masked_text
+        )
+        masked_text = _PHONE_SPACE_RE.sub(
+            partial(_mask_phone_space, masks), masked_text
+        )
+        masked_text = _CEP_FORMATTED_RE.sub(templates["cep_formatted"], masked_text)
+
+        # Apenas dígitos: CEP, RG, telefone e CPF numa única passada
+        masked_text = _PLAIN_DIGITS_RE.sub(
+            partial(_mask_plain_digits, masks), masked_text
+        )
 
     # Aplica padrões customizados se fornecidos
     if custom_patterns:
@@ -380,6 +522,21 @@ def mask_all_pii(
     return masked_text
 
 
+def _mask_name_part(part: str, masks: tuple[str, ...]) -> str:
+    # Iniciais e preposições permanecem visíveis
+    if len(part) == 1 or part.lower() in _PREPOSITIONS:
+        return part
+    # Senão, mascara mantendo apenas a primeira letra
+    return part[0] + _mask_run(masks, len(part) - 1)
+
+
+def _mask_full_name(masks: tuple[str, ...], match: re.Match[str]) -> str:
+    prefix = match.group(1)  # "Nome: "
+    # split() sem argumentos já descarta os espaços das bordas
+    name_parts = match.group(2).split()
+    return prefix + " ".join([_mask_name_part(part, masks) for part in name_parts])
+
+
 def mask_name(text: str, mask_char: str = "*") -> str:
     """Mascara nomes de pessoas no texto.
 
@@ -406,34 +563,8 @@ def mask_name(text: str, mask_char: str = "*") -> str:
         >>> mask_name("Nome: Pedro de Oliveira")
         "Nome: P**** de O*******"
     """
-    # Padrão para capturar "Nome: " seguido do nome completo até o final da linha
-    # Usa $ para indicar final da linha com flag MULTILINE
-    pattern = r"(Nome:\s*)([A-Za-zÀ-ÿ ]+?)(?=\n|$)"
-
-    # Preposições que devem permanecer visíveis
-    prepositions = {"de", "da", "do", "dos", "das", "e"}
-
-    def mask_full_name(match):
-        prefix = match.group(1)  # "Nome: "
-        full_name = match.group(2).strip()  # Nome completo
-
-        # Divide o nome em partes
-        name_parts = full_name.split()
-        masked_parts = []
-
-        for part in name_parts:
-            # Se for preposição, mantém visível
-            if part.lower() in prepositions or len(part) == 1:
-                masked_parts.append(part)
-            # Senão, mascara mantendo apenas a primeira letra
-            else:
-                first_letter = part[0]
-                masked = first_letter + (mask_char * (len(part) - 1))
-                masked_parts.append(masked)
-
-        return prefix + " ".join(masked_parts)
-
-    text = re.sub(pattern, mask_full_name, text, flags=re.IGNORECASE | re.MULTILINE)
+    masks = _mask_strings(mask_char)
+    text = _NAME_RE.sub(partial(_mask_full_name, masks), text)
 
     return text
 
@@ -1,107 +1,486 @@
 """PDF processing utilities for document upload and indexing."""
 
-import asyncio
-from typing import Callable
+from __future__ import annotations
 
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from simple_rag.config.config import settings
 from simple_rag.utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
 logger = setup_logger(__name__)
 
+# Maximum number of chunk batches embedded and written to the vectorstore at once
+MAX_CONCURRENT_INDEXING = min(8, os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=1)
+def _get_splitter() -> RecursiveCharacterTextSplitter:
+    """Build the text splitter once per process and reuse it afterwards.
+
+    The PDF and splitter imports live inside the functions that need them:
+    with several files they only run in the extraction workers, never in
+    the Chainlit process.
+    """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter  # noqa: PLC0415
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1000, chunk_overlap=200, add_start_index=True
+    )
+
+
+def _load_and_split_pdf(path: str, name: str) -> tuple[list[str], list[dict]]:
+    """Load a PDF and split it into chunks (CPU-bound, runs in a worker process).
+
+    Takes plain strings instead of the Chainlit File object, and returns the
+    chunks as parallel text and metadata columns instead of Document objects,
+    so that arguments and results are cheap to pickle across processes and
+    go straight into collection.add.
+
+    Args:
+        path: Path of the uploaded PDF on disk
+        name: Original file name, stored in the chunk metadata
+
+    Returns:
+        Tuple of (texts, metadatas), empty if the PDF has no extractable text
+    """
+    from langchain_community.document_loaders import PyPDFLoader  # noqa: PLC0415
+
+    splitter = _get_splitter()
+    texts = []
+    metadatas = []
+    pages = 0
+
+    # Pages are read one at a time and split right away, so the full page
+    # texts are never held alongside all of the chunks
+    for page in PyPDFLoader(path).lazy_load():
+        pages += 1
+        # Add source filename to metadata
+        page.metadata["source_file"] = name
+        for chunk in splitter.split_documents([page]):
+            # Pre-format the source header once at ingest instead of on every query
+            chunk.metadata["_fmt"] = f"Source: {chunk.metadata}"
+            texts.append(chunk.page_content)
+            metadatas.append(chunk.metadata)
+
+    if pages:
+        logger.info(f"Extracted {pages} page(s) from {name}")
+
+    return texts, metadatas
+
+
+def _chunk_ids(name: str, texts: list[str]) -> list[str]:
+    """Return content-addressed ids for the chunks of a file.
+
+    An id depends only on the file name, the chunk text and how many times
+    that text already appeared earlier in the file, so re-uploading a
+    modified PDF yields the same ids for the chunks that did not change,
+    while repeated texts within a file still get distinct ids.
+
+    Args:
+        name: Original file name
+        texts: Chunk texts of the file, in order
+
+    Returns:
+        One 32-character hex digest (BLAKE2b, 16 bytes) per text
+    """
+    occurrences: dict[str, int] = {}
+    ids = []
+    for text in texts:
+        occurrence = occurrences.get(text, 0)
+        occurrences[text] = occurrence + 1
+        key = f"{name}\0{occurrence}\0{text}".encode()
+        ids.append(hashlib.blake2b(key, digest_size=16).hexdigest())
+    return ids
+
+
+def _existing_ids(vectorstore, ids: list[str]) -> set[str]:
+    """Return which of the given chunk ids are already in the vectorstore.
+
+    Args:
+        vectorstore: ChromaDB vectorstore instance
+        ids: Chunk ids returned by _chunk_ids
+
+    Returns:
+        Subset of ids stored in the collection
+    """
+    if not ids:
+        return set()
+    return set(vectorstore._collection.get(ids=ids, include=[])["ids"])
+
+
+def _mark_indexed(
+    vectorstore, fingerprint: str, ids: list[str], metadatas: list[dict]
+) -> None:
+    """Tag every chunk of a completely indexed file with its fingerprint.
+
+    Runs only after all the file's chunks are stored, so _indexed_name never
+    finds a partially indexed file. It also refreshes the metadata
+    (page/start_index) of chunks kept from an earlier version of the file,
+    without touching their embeddings.
+
+    Args:
+        vectorstore: ChromaDB vectorstore instance
+        fingerprint: Fingerprint returned by _file_fingerprint
+        ids: Ids of all the file's chunks
+        metadatas: Metadata of each chunk, in the same order as ids
+    """
+    vectorstore._collection.update(
+        ids=ids,
+        metadatas=[
+            {**metadata, "file_fingerprint": fingerprint} for metadata in metadatas
+        ],
+    )
+
 
-def _process_single_pdf(uploaded_file, vectorstore) -> tuple[int, str | None]:
-    """Process a single PDF file synchronously (runs in thread pool).
+async def _embed_and_add(
+    ids: list[str], texts: list[str], metadatas: list[dict], vectorstore
+) -> None:
+    """Embed a batch of chunks and write it to the vectorstore.
+
+    The batch is embedded with a single Ollama request and written to the
+    Chroma collection with its precomputed embeddings, so Chroma does not
+    embed the texts again. Ids are content-addressed, so the write is an
+    upsert: a concurrent upload of the same file writing the same chunks
+    overwrites them instead of failing.
 
     Args:
-        uploaded_file: Chainlit File object with PDF content
+        ids: Chunk ids, in the same order as texts
+        texts: Chunk texts to index, possibly from several files
+        metadatas: Metadata of each chunk, in the same order as texts
         vectorstore: ChromaDB vectorstore instance to add documents to
+    """
+    embeddings = await vectorstore.embeddings.aembed_documents(texts)
+    await asyncio.to_thread(
+        vectorstore._collection.upsert,
+        ids=ids,
+        embeddings=embeddings,
+        documents=texts,
+        metadatas=metadatas,
+    )
+
+
+def _file_fingerprint(path: str) -> str:
+    """Return the size and SHA-256 of a file, identifying its contents.
+
+    Args:
+        path: Path of the uploaded PDF on disk
 
     Returns:
-        Tuple of (chunks_added, error_message_or_None)
+        Fingerprint string "<size>_<sha256 hex>"
     """
-    try:
-        logger.info(f"Processing file: {uploaded_file.name}")
+    file_path = Path(path)
+    with file_path.open("rb") as file:
+        digest = hashlib.file_digest(file, "sha256")
+    return f"{file_path.stat().st_size}_{digest.hexdigest()}"
 
-        # Load PDF
-        loader = PyPDFLoader(uploaded_file.path)
-        documents = loader.load()
 
-        if not documents:
-            error_msg = (
-                f"{uploaded_file.name}: PDF is empty or contains no extractable text"
-            )
-            logger.warning(error_msg)
-            return 0, error_msg
+def _indexed_name(vectorstore, fingerprint: str) -> str | None:
+    """Find the stored file whose contents have this fingerprint.
 
-        logger.info(f"Extracted {len(documents)} page(s) from {uploaded_file.name}")
+    Chunks only get the fingerprint once the whole file is stored (see
+    _mark_indexed), so finding any one of them means the file is complete.
 
-        # Add source filename to metadata
-        for doc in documents:
-            doc.metadata["source_file"] = uploaded_file.name
+    Args:
+        vectorstore: ChromaDB vectorstore instance
+        fingerprint: Fingerprint returned by _file_fingerprint
 
-        # Split documents into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=200, add_start_index=True
-        )
-        chunks = text_splitter.split_documents(documents)
+    Returns:
+        File name the contents were indexed under, or None if not indexed
+    """
+    found = vectorstore._collection.get(
+        where={"file_fingerprint": fingerprint}, limit=1, include=["metadatas"]
+    )
+    if not found["ids"]:
+        return None
+    metadatas = found["metadatas"] or [{}]
+    return str(metadatas[0].get("source_file", "?"))
+
+
+async def _find_new_files(
+    uploaded_files: list, vectorstore
+) -> tuple[list[tuple[int, str | None]], list[str]]:
+    """Select the uploaded files whose contents are not indexed yet.
+
+    Files already in the vectorstore, or repeated within the same upload, are
+    skipped before extraction, so they are neither parsed nor embedded again.
+    A renamed copy counts as the same file.
 
-        logger.info(f"Split {uploaded_file.name} into {len(chunks)} chunk(s)")
+    Args:
+        uploaded_files: List of Chainlit File objects with PDF content
+        vectorstore: ChromaDB vectorstore instance
 
-        # Add chunks to vectorstore
-        vectorstore.add_documents(documents=chunks)
+    Returns:
+        Tuple of ((index, fingerprint) of each file to process, message for
+        each skipped file naming the file it duplicates). The fingerprint is
+        None if it could not be computed (extraction will report the error).
+    """
+    fingerprints = await asyncio.gather(
+        *(asyncio.to_thread(_file_fingerprint, f.path) for f in uploaded_files),
+        return_exceptions=True,
+    )
 
-        logger.info(
-            f"Successfully indexed {uploaded_file.name}: {len(chunks)} chunks added"
+    new_files: list[tuple[int, str | None]] = []
+    skipped: list[str] = []
+    seen: dict[str, str] = {}
+    for idx, (uploaded_file, fingerprint) in enumerate(
+        zip(uploaded_files, fingerprints, strict=True)
+    ):
+        if isinstance(fingerprint, BaseException):
+            new_files.append((idx, None))
+            continue
+        existing = seen.get(fingerprint) or await asyncio.to_thread(
+            _indexed_name, vectorstore, fingerprint
         )
+        if existing is not None:
+            message = f"{uploaded_file.name}: already indexed as {existing}"
+            logger.info(f"Skipping {message}")
+            skipped.append(message)
+            continue
+        seen[fingerprint] = uploaded_file.name
+        new_files.append((idx, fingerprint))
+    return new_files, skipped
+
+
+def _check_extracted(name: str, extracted) -> str | None:
+    """Validate the chunks extracted from a single PDF file.
+
+    Args:
+        name: Original file name
+        extracted: (texts, metadatas) returned by _load_and_split_pdf, or the
+            exception raised while extracting them
+
+    Returns:
+        Error message, or None if the chunks can be indexed
+    """
+    if isinstance(extracted, BaseException):
+        logger.error(f"Error processing {name}: {extracted}", exc_info=extracted)
+        return f"{name}: {extracted!s}"
+
+    texts, _ = extracted
+    if not texts:
+        error_msg = f"{name}: PDF is empty or contains no extractable text"
+        logger.warning(error_msg)
+        return error_msg
+
+    logger.info(f"Split {name} into {len(texts)} chunk(s)")
+    return None
+
+
+async def _extract_all(uploaded_files: list) -> list:
+    """Extract and split every uploaded PDF in parallel worker processes.
+
+    Parsing and splitting are CPU-bound and hold the GIL, so they are spread
+    across processes (one per file, capped at the CPU count). The "spawn"
+    start method avoids forking the multi-threaded Chainlit server.
+
+    Args:
+        uploaded_files: List of Chainlit File objects with PDF content
+
+    Returns:
+        One entry per file: its (texts, metadatas), or the exception raised
+    """
+    if not uploaded_files:
+        return []
 
-        return len(chunks), None
+    if len(uploaded_files) == 1:
+        # Not worth starting a process for a single file
+        uploaded_file = uploaded_files[0]
+        results = await asyncio.gather(
+            asyncio.to_thread(
+                _load_and_split_pdf, uploaded_file.path, uploaded_file.name
+            ),
+            return_exceptions=True,
+        )
+        return list(results)
 
-    except Exception as e:
-        error_msg = f"{uploaded_file.name}: {e!s}"
-        logger.error(f"Error processing {uploaded_file.name}: {e}", exc_info=True)
-        return 0, error_msg
+    loop = asyncio.get_running_loop()
+    max_workers = min(len(uploaded_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, _load_and_split_pdf, uploaded_file.path, uploaded_file.name
+                )
+                for uploaded_file in uploaded_files
+            ),
+            return_exceptions=True,
+        )
+    return list(results)
 
 
 async def process_pdf_files(
     uploaded_files: list,
     vectorstore,
-    progress_callback: Callable[[str], None] | None = None,
-) -> tuple[int, list[str]]:
+    progress_callback: Callable[[str], Awaitable[None]] | None = None,
+) -> tuple[int, list[str], list[str]]:
     """Process uploaded PDF files asynchronously and add to vectorstore.
 
+    Files whose contents are already indexed are skipped, and so are chunks
+    already stored from an earlier version of the same file. Text extraction
+    runs in parallel across the remaining files. The chunks of all files are
+    then embedded and written together in batches of settings.embed_batch_size,
+    up to MAX_CONCURRENT_INDEXING batches at a time, so small files do not
+    each pay for a separate embeddings request.
+
     Args:
         uploaded_files: List of Chainlit File objects with PDF content
         vectorstore: ChromaDB vectorstore instance to add documents to
         progress_callback: Optional async callback function to report progress
 
     Returns:
-        Tuple of (total_chunks_added, list_of_error_messages)
+        Tuple of (total_chunks_added, list_of_error_messages,
+        list_of_skipped_file_messages)
     """
-    total_chunks = 0
-    errors = []
-
     logger.info(f"Processing {len(uploaded_files)} PDF file(s)...")
 
-    for idx, uploaded_file in enumerate(uploaded_files, 1):
+    if progress_callback:
+        await progress_callback(
+            f"📄 Extracting text from {len(uploaded_files)} file(s)..."
+        )
+
+    new_files, skipped = await _find_new_files(uploaded_files, vectorstore)
+    extracted = await _extract_all([uploaded_files[idx] for idx, _ in new_files])
+
+    # Pool the chunks of every valid file, remembering which file each came from
+    all_ids: list[str] = []
+    all_texts: list[str] = []
+    all_metadatas: list[dict] = []
+    owners: list[int] = []
+    file_errors: dict[int, str] = {}
+    # Chunks of each file, tagged with its fingerprint once all are stored
+    file_chunks: dict[int, tuple[str, list[str], list[dict]]] = {}
+    for (idx, fingerprint), result in zip(new_files, extracted, strict=True):
+        error = _check_extracted(uploaded_files[idx].name, result)
+        if error:
+            file_errors[idx] = error
+            continue
+        texts, metadatas = result
+        ids = _chunk_ids(uploaded_files[idx].name, texts)
+        if fingerprint is not None:
+            file_chunks[idx] = (fingerprint, ids, metadatas)
+        all_ids.extend(ids)
+        all_texts.extend(texts)
+        all_metadatas.extend(metadatas)
+        owners.extend([idx] * len(texts))
+
+    # Chunks unchanged since an earlier upload of the same file are not
+    # embedded again. An id repeated within this upload (same name and text in
+    # two files) is written once, and the second file then depends on the
+    # first one's batch.
+    existing = await asyncio.to_thread(
+        _existing_ids, vectorstore, list(dict.fromkeys(all_ids))
+    )
+    keep: list[int] = []
+    owner_of: dict[str, int] = {}
+    depends_on: dict[int, set[int]] = {}
+    for pos, chunk_id in enumerate(all_ids):
+        if chunk_id in owner_of:
+            if owner_of[chunk_id] != owners[pos]:
+                depends_on.setdefault(owners[pos], set()).add(owner_of[chunk_id])
+            continue
+        owner_of[chunk_id] = owners[pos]
+        if chunk_id not in existing:
+            keep.append(pos)
+    if len(keep) < len(owner_of):
+        logger.info(f"Skipping {len(owner_of) - len(keep)} chunk(s) already indexed")
+    if len(keep) < len(all_ids):
+        all_ids = [all_ids[pos] for pos in keep]
+        all_texts = [all_texts[pos] for pos in keep]
+        all_metadatas = [all_metadatas[pos] for pos in keep]
+        owners = [owners[pos] for pos in keep]
+
+    batch_size = settings.embed_batch_size
+    starts = range(0, len(all_texts), batch_size)
+
+    if progress_callback and all_texts:
+        await progress_callback(
+            f"📄 Indexing {len(all_texts)} chunk(s) from "
+            f"{len(new_files) - len(file_errors)} file(s)..."
+        )
+
+    # Cap concurrency so the embedding backend is not flooded with requests
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_INDEXING)
+    indexed = 0
+
+    async def index_batch(start: int) -> None:
+        nonlocal indexed
+        end = start + batch_size
+        texts = all_texts[start:end]
+        async with semaphore:
+            await _embed_and_add(
+                all_ids[start:end], texts, all_metadatas[start:end], vectorstore
+            )
+
         # Update progress
+        indexed += len(texts)
         if progress_callback:
             await progress_callback(
-                f"📄 Processing file {idx}/{len(uploaded_files)}: {uploaded_file.name}..."
+                f"📄 Indexed {indexed}/{len(all_texts)} chunk(s)..."
             )
 
-        # Run the blocking PDF processing in a thread pool
-        chunks_added, error = await asyncio.to_thread(
-            _process_single_pdf, uploaded_file, vectorstore
-        )
+    results = await asyncio.gather(
+        *(index_batch(start) for start in starts), return_exceptions=True
+    )
 
-        total_chunks += chunks_added
-        if error:
-            errors.append(error)
+    added = [0] * len(uploaded_files)
+    for start, result in zip(starts, results, strict=True):
+        batch_owners = owners[start : start + batch_size]
+        if isinstance(result, BaseException):
+            # A failed batch fails every file that had chunks in it
+            for idx in dict.fromkeys(batch_owners):
+                name = uploaded_files[idx].name
+                if idx not in file_errors:
+                    logger.error(f"Error processing {name}: {result}", exc_info=result)
+                    file_errors[idx] = f"{name}: {result!s}"
+            continue
+        for idx in batch_owners:
+            added[idx] += 1
+
+    # Only files whose chunks were all stored are marked as indexed; a failed
+    # or partial file is extracted again on the next upload
+    for idx, (fingerprint, ids, metadatas) in file_chunks.items():
+        failed = file_errors.keys() & ({idx} | depends_on.get(idx, set()))
+        if failed:
+            file_errors.setdefault(
+                idx, f"{uploaded_files[idx].name}: shares chunks with a failed file"
+            )
+            continue
+        try:
+            await asyncio.to_thread(
+                _mark_indexed, vectorstore, fingerprint, ids, metadatas
+            )
+        except Exception as e:
+            name = uploaded_files[idx].name
+            logger.error(f"Error processing {name}: {e}", exc_info=True)
+            file_errors[idx] = f"{name}: {e!s}"
+
+    for idx, _ in new_files:
+        uploaded_file = uploaded_files[idx]
+        if idx not in file_errors:
+            logger.info(
+                f"Successfully indexed {uploaded_file.name}: "
+                f"{added[idx]} chunks added"
+            )
+
+    total_chunks = sum(added)
+    errors = [file_errors[idx] for idx in sorted(file_errors)]
 
     logger.info(
         f"PDF processing complete: {total_chunks} total chunks added, {len(errors)} errors"
     )
 
-    return total_chunks, errors
+    return total_chunks, errors, skipped
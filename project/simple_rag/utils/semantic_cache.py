@@ -0,0 +1,135 @@
+"""Cache semântico em memória para resultados de recuperação.
+
+Armazena pares (embedding da query, resultado) e retorna o resultado de uma
+query anterior quando a similaridade de cosseno entre os embeddings é maior ou
+igual a um limiar configurado. As entradas expiram após um TTL e são separadas
+por namespace (por exemplo, o id da sessão do Chainlit).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+# (embedding normalizado, instante de expiração, resultado)
+_Entry = tuple[np.ndarray, float, Any]
+
+
+def _normalize(embedding: list[float]) -> np.ndarray:
+    """Normaliza o vetor para norma unitária (cosseno vira produto interno)."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm == 0.0:
+        return vector
+    return vector / norm
+
+
+class _Namespace:
+    """Entradas de um namespace e a matriz (N, d) dos seus embeddings."""
+
+    def __init__(self):
+        self.entries: OrderedDict[int, _Entry] = OrderedDict()
+        # Reconstruída sob demanda quando o conjunto de entradas muda
+        self._ids: list[int] = []
+        self._matrix: np.ndarray | None = None
+
+    def invalidate(self) -> None:
+        self._matrix = None
+
+    def matrix(self) -> tuple[list[int], np.ndarray]:
+        if self._matrix is None:
+            self._ids = list(self.entries)
+            self._matrix = np.stack([self.entries[i][0] for i in self._ids])
+        return self._ids, self._matrix
+
+
+class SemanticCache:
+    """Cache de resultados indexado por similaridade de embeddings."""
+
+    def __init__(self, threshold: float, ttl_s: float, max_entries: int = 256):
+        """Inicializa o cache.
+
+        Args:
+            threshold: Similaridade de cosseno mínima para considerar um hit
+            ttl_s: Tempo de vida de cada entrada, em segundos
+            max_entries: Número máximo de entradas por namespace (LRU)
+        """
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._namespaces: dict[str, _Namespace] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding: list[float], namespace: str = "default") -> Any | None:
+        """Busca o resultado mais similar ao embedding informado.
+
+        Os scores de todas as entradas saem de um único produto matriz-vetor.
+
+        Args:
+            embedding: Embedding da query
+            namespace: Namespace das entradas (ex.: id da sessão)
+
+        Returns:
+            Resultado armazenado, ou None se não houver hit
+        """
+        query = _normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            space = self._namespaces.get(namespace)
+            if space is None:
+                return None
+
+            expired = [
+                entry_id
+                for entry_id, (_, expires_at, _) in space.entries.items()
+                if expires_at <= now
+            ]
+            if expired:
+                for entry_id in expired:
+                    del space.entries[entry_id]
+                space.invalidate()
+            if not space.entries:
+                return None
+
+            ids, matrix = space.matrix()
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            best_id = ids[best]
+            space.entries.move_to_end(best_id)
+            return space.entries[best_id][2]
+
+    def store(
+        self, embedding: list[float], value: Any, namespace: str = "default"
+    ) -> None:
+        """Armazena um resultado associado ao embedding da query.
+
+        Args:
+            embedding: Embedding da query
+            value: Resultado a ser armazenado
+            namespace: Namespace das entradas (ex.: id da sessão)
+        """
+        vector = _normalize(embedding)
+        expires_at = time.monotonic() + self.ttl_s
+
+        with self._lock:
+            space = self._namespaces.setdefault(namespace, _Namespace())
+            space.entries[self._next_id] = (vector, expires_at, value)
+            self._next_id += 1
+            while len(space.entries) > self.max_entries:
+                space.entries.popitem(last=False)
+            space.invalidate()
+
+    def clear(self, namespace: str | None = None) -> None:
+        """Remove as entradas de um namespace, ou de todos se None."""
+        with self._lock:
+            if namespace is None:
+                self._namespaces.clear()
+            else:
+                self._namespaces.pop(namespace, None)
@@ -1,23 +1,55 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from langchain_chroma import Chroma
-from langchain_community.document_loaders import TextLoader
-from langchain_ollama import OllamaEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 
 from simple_rag.utils.logger import setup_logger
 from simple_rag.config.config import settings
 
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
 logger = setup_logger(__name__)
 
+# Chroma, Ollama and the text splitter are imported on first use, so importing
+# this module (e.g. at Chainlit start-up) stays cheap
 
-def _load_documents(directory: str = "./data/anamnese") -> list:
-    documents = []
 
-    for file in Path(directory).glob("*.txt"):
-        documents.extend(TextLoader(file).load())
+@lru_cache(maxsize=1)
+def _get_splitter() -> RecursiveCharacterTextSplitter:
+    """Build the text splitter once and reuse it afterwards."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter  # noqa: PLC0415
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1000, chunk_overlap=200, add_start_index=True
+    )
+
+
+# Upper bound on threads reading .txt files at once
+_MAX_READ_WORKERS = 32
+
+
+def _read_document(file: Path) -> Document:
+    # Plain .txt files: read directly, with the same metadata TextLoader sets
+    return Document(
+        page_content=file.read_text(encoding="utf-8"),
+        metadata={"source": str(file)},
+    )
+
+
+def _load_documents(directory: str = "./data/anamnese") -> list:
+    files = list(Path(directory).glob("*.txt"))
+    if len(files) <= 1:
+        return [_read_document(file) for file in files]
 
-    return documents
+    # Overlap the reads of many small files; map keeps the glob order
+    with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(files))) as pool:
+        return list(pool.map(_read_document, files))
 
 
 def split_documents(documents: list) -> list:
@@ -31,37 +63,92 @@ def split_documents(documents: list) -> list:
     Returns:
         List of document chunks.
     """
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000, chunk_overlap=200, add_start_index=True
-    )
     logger.info(
         "Splitting documents into chunks... chunk_size=1000 and chunk_overlap=200"
     )
-    return text_splitter.split_documents(documents)
-
-
-def _split_documents(documents: list) -> list:
-    """Divide os documentos em chunks."""
-    return split_documents(documents)
+    return _get_splitter().split_documents(documents)
 
 
-def get_ollama_embedding_function(model: str = "llama3"):
-    """Get Ollama embedding function.
+@lru_cache(maxsize=4)
+def get_ollama_embedding_function(model: str | None = None):
+    """Get Ollama embedding function, cached per model.
 
     Args:
-        model: Name of the Ollama model to use for embeddings.
+        model: Name of the Ollama model to use for embeddings. Defaults to
+            settings.embedding_model.
 
     Returns:
         OllamaEmbeddings instance.
     """
+    from langchain_ollama import OllamaEmbeddings  # noqa: PLC0415
+
+    model = model or settings.embedding_model
     logger.info(f"Loading Ollama embedding model: {model}")
-    return OllamaEmbeddings(model=settings.embedding_model)
+    return OllamaEmbeddings(model=model)
+
+
+# Parameters fixed when the collection is created, and the matching keys in
+# the HNSW configuration Chroma reports for it
+_HNSW_CREATION_SETTINGS: dict[str, str] = {
+    "hnsw_space": "space",
+    "hnsw_m": "max_neighbors",
+    "hnsw_ef_construction": "ef_construction",
+}
 
 
+def _check_collection_config(vector_store: Chroma) -> None:
+    """Log the collection's actual HNSW configuration and reconcile it.
+
+    Chroma ignores the metadata passed for a collection that already exists,
+    so the configured values may not be in effect. ef_search can be changed
+    in place and is updated; the metric, M and ef_construction are fixed at
+    creation, so a mismatch only logs a warning (reindexing into a new
+    collection is required to change them).
+
+    Args:
+        vector_store: Chroma vector store whose collection was just opened.
+    """
+    collection = vector_store._collection
+    actual = collection.configuration.get("hnsw") or {}
+    logger.info(f"ChromaDB collection '{collection.name}' HNSW: {actual}")
+    if not actual:
+        return
+
+    if actual.get("ef_search") != settings.hnsw_ef_search:
+        try:
+            collection.modify(
+                configuration={"hnsw": {"ef_search": settings.hnsw_ef_search}}
+            )
+        except Exception as e:
+            logger.warning(f"Could not update ChromaDB ef_search: {e}")
+        else:
+            logger.info(
+                f"ChromaDB ef_search updated: {actual.get('ef_search')} -> "
+                f"{settings.hnsw_ef_search}"
+            )
+
+    for field, key in _HNSW_CREATION_SETTINGS.items():
+        configured = getattr(settings, field)
+        if actual.get(key) != configured:
+            logger.warning(
+                f"ChromaDB collection '{collection.name}' has {key}="
+                f"{actual.get(key)!r}, but {field}={configured!r} is configured. "
+                "It only applies to new collections; reindex into a new "
+                "collection to change it."
+            )
+
+
+@lru_cache(maxsize=4)
 def get_vectorstore(
     collection_name: str = "my_collection",
 ) -> Chroma:
-    """Get or create a ChromaDB vector store.
+    """Get or create a ChromaDB vector store, cached per collection.
+
+    The Chroma client is safe to share, so every caller reuses the same
+    instance instead of opening a new connection. With
+    settings.chroma_mode == "embedded" Chroma runs in-process on
+    settings.get_chroma_persist_dir() instead of going through the HTTP
+    server.
 
     Args:
         collection_name: Name of the collection to use.
@@ -69,19 +156,41 @@ def get_vectorstore(
     Returns:
         Chroma vector store instance.
     """
-    vector_store = Chroma(
-        collection_name="my_collection",
-        embedding_function=get_ollama_embedding_function(),
-        host="localhost",
-        port="9001"
-    )
+    from langchain_chroma import Chroma  # noqa: PLC0415
+
+    collection_metadata: dict[str, Any] = {
+        "hnsw:space": settings.hnsw_space,
+        "hnsw:M": settings.hnsw_m,
+        "hnsw:construction_ef": settings.hnsw_ef_construction,
+        "hnsw:search_ef": settings.hnsw_ef_search,
+    }
+    if settings.chroma_mode == "embedded":
+        persist_dir = settings.get_chroma_persist_dir()
+        logger.info(f"ChromaDB embedded at {persist_dir}")
+        vector_store = Chroma(
+            collection_name=collection_name,
+            embedding_function=get_ollama_embedding_function(),
+            collection_metadata=collection_metadata,
+            persist_directory=str(persist_dir),
+        )
+    else:
+        vector_store = Chroma(
+            collection_name=collection_name,
+            embedding_function=get_ollama_embedding_function(),
+            collection_metadata=collection_metadata,
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+        )
+    _check_collection_config(vector_store)
     # _load_vectorstore(vector_store)
     return vector_store
 
 
 def load_vectorstore(vector_store: Chroma):
     logger.info("Loading documents into vectorstore...")
-    all_splits = _split_documents(_load_documents())
+    all_splits = split_documents(_load_documents())
+    for split in all_splits:
+        split.metadata["_fmt"] = f"Source: {split.metadata}"
     vector_store.add_documents(documents=all_splits)
     logger.info("Vectorstore loaded.")
 
@@ -0,0 +1,131 @@
+"""Testes do grafo do agente com um LLM falso."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import (
+    FakeMessagesListChatModel,
+)
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from simple_rag.agent import agent as agent_module
+
+
+@pytest.fixture
+def llm_calls(monkeypatch) -> list:
+    """Substitui o LLM por um falso e registra o prompt de cada chamada."""
+    calls: list = []
+
+    def fake_llm_with_tools(*args, **kwargs):
+        llm = FakeMessagesListChatModel(
+            responses=[AIMessage(content=f"resposta {len(calls) + 1}")]
+        )
+        return llm.with_listeners(on_start=calls.append)
+
+    monkeypatch.setattr(agent_module, "get_llm_with_tools", fake_llm_with_tools)
+    return calls
+
+
+@pytest.fixture
+def agent(llm_calls):
+    """Agente novo cujo LLM responde sem tool calls."""
+    return agent_module.create_agent()
+
+
+def _run(agent, content: str, thread_id: str = "teste") -> list:
+    config = {"configurable": {"thread_id": thread_id}}
+    result = asyncio.run(
+        agent.ainvoke({"messages": [HumanMessage(content=content)]}, config=config)
+    )
+    return result["messages"]
+
+
+def test_each_turn_adds_one_answer(agent):
+    """Cada mensagem gerada entra uma única vez no histórico."""
+    messages = _run(agent, "qual a idade do paciente?")
+    assert [type(m) for m in messages] == [HumanMessage, AIMessage]
+
+    # Turno respondido direto pelo classify (aresta condicional até o END)
+    messages = _run(agent, "oi")
+    assert [type(m) for m in messages] == [
+        HumanMessage,
+        AIMessage,
+        HumanMessage,
+        AIMessage,
+    ]
+
+
+def test_repeated_question_calls_llm_again(agent, llm_calls):
+    """Uma pergunta repetida recebe uma nova resposta do LLM."""
+    _run(agent, "qual a idade do paciente?")
+    messages = _run(agent, "qual a idade do paciente?")
+
+    assert len(llm_calls) == 2
+    assert messages[-1].content == "resposta 2"
+
+
+def _tool_round(call_id: str) -> list:
+    """Uma tool call seguida da sua resposta."""
+    call = {"name": "retrieve_context", "args": {"query": "x"}, "id": call_id}
+    return [
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content="contexto", tool_call_id=call_id),
+    ]
+
+
+@pytest.mark.parametrize(("k", "expected"), [(2, 4), (3, 1), (4, 1), (10, 0)])
+def test_window_start_never_splits_a_tool_call(k, expected):
+    # 0: Human, 1: AI com tool call, 2-3: ToolMessages, 4: AI, 5: Human
+    call = {"name": "retrieve_context", "args": {"query": "x"}, "id": "1"}
+    messages = [
+        HumanMessage(content="pergunta"),
+        AIMessage(content="", tool_calls=[call, {**call, "id": "2"}]),
+        ToolMessage(content="a", tool_call_id="1"),
+        ToolMessage(content="b", tool_call_id="2"),
+        AIMessage(content="resposta"),
+        HumanMessage(content="outra pergunta"),
+    ]
+
+    start = agent_module._window_start(messages, k)
+
+    assert start == expected
+    assert not isinstance(messages[start], ToolMessage)
+
+
+@pytest.fixture
+def summaries(monkeypatch, llm_calls) -> list:
+    """Registra as chamadas de _summarize com gatilho e janela pequenos."""
+    calls: list = []
+
+    async def fake_summarize(messages, previous_summary):
+        calls.append(messages)
+        return f"resumo {len(calls)}"
+
+    monkeypatch.setattr(agent_module, "_summarize", fake_summarize)
+    monkeypatch.setattr(agent_module, "HISTORY_SUMMARY_TRIGGER", 4)
+    monkeypatch.setattr(agent_module, "HISTORY_WINDOW", 2)
+    return calls
+
+
+def test_summary_runs_at_most_once_per_turn(summaries):
+    history = []
+    for i in range(3):
+        history += [HumanMessage(content=f"pergunta {i}"), AIMessage(content="r")]
+    history.append(HumanMessage(content="nova pergunta"))
+
+    # Primeira chamada do turno: resume tudo fora da janela
+    update = asyncio.run(agent_module.ollama_call({"messages": history}))
+    assert len(summaries) == 1
+    assert update["summarized_count"] == len(history) - 2
+
+    # Chamadas seguintes do mesmo turno, após tool calls, não resumem de novo
+    history += update["messages"] + _tool_round("a") + _tool_round("b")
+    state = {
+        "messages": history,
+        "history_summary": update["history_summary"],
+        "summarized_count": update["summarized_count"],
+    }
+    update = asyncio.run(agent_module.ollama_call(state))
+
+    assert len(summaries) == 1
+    assert "summarized_count" not in update
@@ -0,0 +1,42 @@
+"""Testes de mascaramento de dados sensíveis."""
+
+import pytest
+
+from simple_rag.utils.data_masking import mask_all_pii, mask_email
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Email: user@example.com", "Email: user@example.com"),
+        ("Email: username@example.com", "Email: user****@example.com"),
+        ("Email: jo@example.com", "Email: jo@example.com"),
+        # O email curto é consumido inteiro: o segmento seguinte não é mascarado
+        ("386@mail.com@mail.com", "386@mail.com@mail.com"),
+        ("ab@long.com@x.io", "ab@long.com@x.io"),
+    ],
+)
+def test_mask_email(text, expected):
+    assert mask_email(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("CPF: 123.456.789-00", "CPF: 123.***.***-00"),
+        ("CPF 12345678901", "CPF 123*****901"),
+        # 11 dígitos sem contexto são tratados como CPF
+        ("12345678901", "123*****901"),
+        ("Tel: 11987654321", "Tel: *******4321"),
+        ("Telefone 11987654321", "Telefone *******4321"),
+        # A palavra-chave mais próxima decide
+        ("cpf tel 12345678901", "cpf tel *******8901"),
+        ("tel cpf 12345678901", "tel cpf 123*****901"),
+        # "tel" dentro de outra palavra não indica telefone
+        ("Estelionato 12345678901", "Estelionato 123*****901"),
+        ("hotel 12345678901", "hotel 123*****901"),
+        ("joao.silva@email.com 12345678901", "joao******@email.com 123*****901"),
+    ],
+)
+def test_mask_all_pii(text, expected):
+    assert mask_all_pii(text) == expected
@@ -0,0 +1,122 @@
+"""Testes do dedupe e da indexação de uploads de PDF."""
+
+import asyncio
+import shutil
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import chromadb
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+
+from simple_rag.config.config import settings
+from simple_rag.utils import pdf_processor
+from simple_rag.utils.pdf_processor import process_pdf_files
+
+
+class FakeEmbeddings(Embeddings):
+    """Embeddings determinísticos; as chamadas em fail_on levantam erro."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail_on: set[int] = set()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(len(text)), 1.0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.calls in self.fail_on:
+            raise RuntimeError("embedding failed")
+        return self.embed_documents(texts)
+
+
+def _fake_load_and_split(path: str, name: str) -> tuple[list[str], list[dict]]:
+    """Um chunk por linha do arquivo, no lugar do PDF."""
+    texts = Path(path).read_text(encoding="utf-8").splitlines()
+    return texts, [{"source_file": name, "line": i} for i in range(len(texts))]
+
+
+@pytest.fixture(autouse=True)
+def fake_extraction(monkeypatch):
+    monkeypatch.setattr(pdf_processor, "_load_and_split_pdf", _fake_load_and_split)
+
+
+@pytest.fixture
+def embeddings() -> FakeEmbeddings:
+    return FakeEmbeddings()
+
+
+@pytest.fixture
+def vectorstore(embeddings) -> Chroma:
+    return Chroma(
+        collection_name=f"test-{uuid.uuid4().hex}",
+        client=chromadb.EphemeralClient(),
+        embedding_function=embeddings,
+    )
+
+
+def _make_file(tmp_path, name: str, lines: int) -> SimpleNamespace:
+    path = tmp_path / name
+    path.write_text("\n".join(f"linha {i}" for i in range(lines)), encoding="utf-8")
+    return SimpleNamespace(path=str(path), name=name)
+
+
+def _upload(vectorstore, *files):
+    return asyncio.run(process_pdf_files(list(files), vectorstore))
+
+
+def test_reupload_is_skipped(tmp_path, vectorstore):
+    doc = _make_file(tmp_path, "a.pdf", 5)
+
+    assert _upload(vectorstore, doc) == (5, [], [])
+    assert _upload(vectorstore, doc) == (0, [], ["a.pdf: already indexed as a.pdf"])
+    assert vectorstore._collection.count() == 5
+
+
+def test_renamed_copy_is_skipped(tmp_path, vectorstore):
+    doc = _make_file(tmp_path, "a.pdf", 5)
+    copy = SimpleNamespace(path=str(tmp_path / "b.pdf"), name="b.pdf")
+    shutil.copy(doc.path, copy.path)
+
+    _upload(vectorstore, doc)
+
+    assert _upload(vectorstore, copy) == (0, [], ["b.pdf: already indexed as a.pdf"])
+    assert vectorstore._collection.count() == 5
+
+
+def test_file_repeated_within_upload_is_indexed_once(tmp_path, vectorstore):
+    doc = _make_file(tmp_path, "a.pdf", 5)
+    copy = SimpleNamespace(path=str(tmp_path / "b.pdf"), name="b.pdf")
+    shutil.copy(doc.path, copy.path)
+
+    assert _upload(vectorstore, doc, copy) == (
+        5,
+        [],
+        ["b.pdf: already indexed as a.pdf"],
+    )
+    assert vectorstore._collection.count() == 5
+
+
+def test_failed_batch_is_retried_on_reupload(tmp_path, vectorstore, embeddings):
+    lines = settings.embed_batch_size + 8
+    doc = _make_file(tmp_path, "a.pdf", lines)
+
+    # Segunda requisição de embeddings falha: o arquivo fica indexado pela metade
+    embeddings.fail_on = {2}
+    added, errors, skipped = _upload(vectorstore, doc)
+    assert 0 < added < lines
+    assert len(errors) == 1
+    assert skipped == []
+
+    # Não é tratado como já indexado: só os chunks que faltavam são embutidos
+    embeddings.fail_on = set()
+    assert _upload(vectorstore, doc) == (lines - added, [], [])
+    assert vectorstore._collection.count() == lines
+
+    assert _upload(vectorstore, doc) == (0, [], ["a.pdf: already indexed as a.pdf"])
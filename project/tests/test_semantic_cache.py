@@ -0,0 +1,115 @@
+"""Testes do cache semântico de resultados de recuperação."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from simple_rag.utils import semantic_cache
+from simple_rag.utils.semantic_cache import SemanticCache
+
+A = [1.0, 0.0, 0.0]
+B = [0.0, 1.0, 0.0]
+C = [0.0, 0.0, 1.0]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio controlado pelo teste no lugar de time.monotonic."""
+    now = SimpleNamespace(value=0.0)
+    monkeypatch.setattr(
+        semantic_cache, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    return now
+
+
+def test_similar_query_hits():
+    cache = SemanticCache(threshold=0.95, ttl_s=60)
+    cache.store(A, "a")
+
+    assert cache.lookup([2.0, 0.01, 0.0]) == "a"
+
+
+def test_threshold():
+    cache = SemanticCache(threshold=0.95, ttl_s=60)
+    cache.store(A, "a")
+
+    # Cosseno de 0.9 com A: abaixo do limiar
+    assert cache.lookup([0.9, 0.43589, 0.0]) is None
+    # Cosseno de 0.96 com A: acima do limiar
+    assert cache.lookup([0.96, 0.28, 0.0]) == "a"
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SemanticCache(threshold=0.95, ttl_s=10)
+    cache.store(A, "a")
+
+    clock.value = 9.0
+    assert cache.lookup(A) == "a"
+
+    clock.value = 10.0
+    assert cache.lookup(A) is None
+
+
+def test_expired_entry_is_dropped_but_others_remain(clock):
+    cache = SemanticCache(threshold=0.95, ttl_s=10)
+    cache.store(A, "a")
+    clock.value = 5.0
+    cache.store(B, "b")
+
+    clock.value = 12.0
+    assert cache.lookup(A) is None
+    assert cache.lookup(B) == "b"
+
+
+def test_lru_eviction_is_per_namespace():
+    cache = SemanticCache(threshold=0.95, ttl_s=60, max_entries=2)
+    cache.store(A, "a", namespace="s1")
+    cache.store(B, "b", namespace="s1")
+    cache.store(C, "c", namespace="s2")
+
+    # O hit em A o torna o mais recente; B é o próximo a sair
+    assert cache.lookup(A, namespace="s1") == "a"
+    cache.store(C, "c1", namespace="s1")
+
+    assert cache.lookup(B, namespace="s1") is None
+    assert cache.lookup(A, namespace="s1") == "a"
+    assert cache.lookup(C, namespace="s1") == "c1"
+    # O outro namespace não é afetado
+    assert cache.lookup(C, namespace="s2") == "c"
+    assert cache.lookup(A, namespace="s2") is None
+
+
+def test_matrix_is_rebuilt_after_eviction():
+    cache = SemanticCache(threshold=0.95, ttl_s=60, max_entries=2)
+    cache.store(A, "a")
+    cache.store(B, "b")
+    # Monta a matriz com A e B
+    assert cache.lookup(B) == "b"
+
+    # Expulsa A: a matriz antiga não pode mais ser usada
+    cache.store(C, "c")
+
+    assert cache.lookup(A) is None
+    assert cache.lookup(B) == "b"
+    assert cache.lookup(C) == "c"
+
+
+def test_zero_vector_misses():
+    cache = SemanticCache(threshold=0.95, ttl_s=60)
+    cache.store(A, "a")
+    cache.store([0.0, 0.0, 0.0], "zero")
+
+    assert cache.lookup([0.0, 0.0, 0.0]) is None
+
+
+def test_clear():
+    cache = SemanticCache(threshold=0.95, ttl_s=60)
+    cache.store(A, "a", namespace="s1")
+    cache.store(A, "a", namespace="s2")
+
+    cache.clear("s1")
+    assert cache.lookup(A, namespace="s1") is None
+    assert cache.lookup(A, namespace="s2") == "a"
+
+    cache.clear()
+    assert cache.lookup(A, namespace="s2") is None